@@ -3,45 +3,71 @@ Configuration file for the news scraper.
 Edit these settings to control storage backend and other options.
 """
 
+import functools
+import importlib.util
 import os
-from typing import Dict, Any
-from dotenv import load_dotenv
+from types import MappingProxyType
+from typing import Dict, Mapping, Any
+
+from util.tools import load_env
 
 # Load environment variables from .env file
-load_dotenv()
+load_env()
+
+# Snapshot the environment once so every setting below is a plain dict lookup
+_ENV: dict[str, str] = dict(os.environ)
+
+
+def _env(key: str, default: Any = None) -> Any:
+    """Read a setting from the import-time environment snapshot."""
+    return _ENV.get(key, default)
+
+
+@functools.lru_cache(maxsize=None)
+def _env_int(key: str, default: int) -> int:
+    """Read an integer setting, parsed once and cached per key."""
+    value = _ENV.get(key)
+    if value is None:
+        return default
+    try:
+        return int(value)
+    except ValueError:
+        raise ValueError(f"{key} must be an integer, got {value!r}") from None
+
 
 # ============================================================================
 # STORAGE CONFIGURATION
 # ============================================================================
 
 # Choose storage backend: 'sqlite', 'duckdb', 'motherduck', or 'bigquery'
-STORAGE_BACKEND = os.getenv('STORAGE_BACKEND', 'duckdb')
+STORAGE_BACKEND = _env('STORAGE_BACKEND', 'duckdb')
+_STORAGE_BACKEND_LOWER = STORAGE_BACKEND.lower()
 
 # SQLite Configuration
 SQLITE_CONFIG = {
-    'db_path': os.getenv('SQLITE_DB_PATH', 'articles_raw.db'),
-    'table_name': os.getenv('TABLE_NAME', 'articles_raw')
+    'db_path': _env('SQLITE_DB_PATH', 'articles_raw.db'),
+    'table_name': _env('TABLE_NAME', 'articles_raw')
 }
 
 # DuckDB Configuration
 DUCKDB_CONFIG = {
-    'db_path': os.getenv('DUCKDB_DB_PATH', 'articles_raw.duckdb'),
-    'table_name': os.getenv('TABLE_NAME', 'articles_raw')
+    'db_path': _env('DUCKDB_DB_PATH', 'articles_raw.duckdb'),
+    'table_name': _env('TABLE_NAME', 'articles_raw')
 }
 
 # MotherDuck Configuration (cloud-hosted DuckDB)
 # Requires MOTHERDUCK_TOKEN to be set in your environment or .env file.
 # Get your token from https://app.motherduck.com → Settings → Access Tokens
 MOTHERDUCK_CONFIG = {
-    'database':   os.getenv('MOTHERDUCK_DB', 'ph_news'),
-    'table_name': os.getenv('TABLE_NAME', 'articles_raw'),
+    'database':   _env('MOTHERDUCK_DB', 'ph_news'),
+    'table_name': _env('TABLE_NAME', 'articles_raw'),
 }
 
 # BigQuery Configuration
 BIGQUERY_CONFIG = {
-    'dataset_id': os.getenv('BQ_DATASET_ID', 'ph_news_raw'),
-    'table_name': os.getenv('BQ_TABLE_NAME', 'articles_raw'),
-    'buffer_size': int(os.getenv('BQ_BUFFER_SIZE', 100))
+    'dataset_id': _env('BQ_DATASET_ID', 'ph_news_raw'),
+    'table_name': _env('BQ_TABLE_NAME', 'articles_raw'),
+    'buffer_size': _env_int('BQ_BUFFER_SIZE', 100)
 }
 
 # ============================================================================
@@ -49,39 +75,78 @@ BIGQUERY_CONFIG = {
 # ============================================================================
 
 # Default number of days to look back
-DEFAULT_DAYS_BACK = int(os.getenv('DAYS_BACK', 7))
+DEFAULT_DAYS_BACK = _env_int('DAYS_BACK', 7)
 
 # Manila Bulletin section IDs to scrape
 # 25=Philippines, 26=Business, 27=World, 28=Lifestyle, 
 # 29=Entertainment, 30=Sports, 31=Opinion
 MANILA_BULLETIN_SECTIONS = [25, 26, 27, 28, 29, 30, 31]
 
+# Backend name -> its configuration block
+_ALL_BACKENDS = {
+    'sqlite':     SQLITE_CONFIG,
+    'duckdb':     DUCKDB_CONFIG,
+    'motherduck': MOTHERDUCK_CONFIG,
+    'bigquery':   BIGQUERY_CONFIG,
+}
+
+# Optional driver each backend needs (sqlite3 ships with Python)
+_BACKEND_DRIVERS = {
+    'duckdb':     'duckdb',
+    'motherduck': 'duckdb',
+    'bigquery':   'google.cloud.bigquery',
+}
+
+
+def _driver_installed(module_name: str) -> bool:
+    """Check whether a driver is importable without actually importing it."""
+    try:
+        return importlib.util.find_spec(module_name) is not None
+    except ModuleNotFoundError:
+        # Parent package (e.g. 'google') is missing altogether
+        return False
+
+
+# Only backends whose drivers are installed, resolved with a single lookup
+_BACKENDS = {
+    name: backend_config
+    for name, backend_config in _ALL_BACKENDS.items()
+    if name not in _BACKEND_DRIVERS or _driver_installed(_BACKEND_DRIVERS[name])
+}
+
 # ============================================================================
 # HELPER FUNCTIONS
 # ============================================================================
 
-def get_storage_config(backend_override: str = None) -> Dict[str, Any]:
+def _backend_config(backend: str) -> Dict[str, Any]:
+    """Look up a backend's configuration block, raising on unknown or unavailable names."""
+    backend_config = _BACKENDS.get(backend)
+    if backend_config is None:
+        if backend in _ALL_BACKENDS:
+            raise ValueError(
+                f"Storage backend '{backend}' requires the "
+                f"'{_BACKEND_DRIVERS[backend]}' package, which is not installed"
+            )
+        raise ValueError(f"Unknown storage backend: {backend}")
+    return backend_config
+
+
+@functools.lru_cache(maxsize=4)
+def get_storage_config(backend_override: str = None) -> Mapping[str, Any]:
     """
     Get the storage configuration based on the selected backend.
 
+    The result is built once per backend and cached, so it is returned as a
+    read-only mapping — copy it with dict(...) if you need to modify it.
+
     Args:
         backend_override: Optional backend name to override STORAGE_BACKEND env var.
 
     Returns:
-        Dict containing the backend type and its configuration
+        Read-only mapping containing the backend type and its configuration
     """
-    backend = (backend_override or STORAGE_BACKEND).lower()
-    
-    if backend == 'sqlite':
-        return {'backend_type': 'sqlite', **SQLITE_CONFIG}
-    elif backend == 'duckdb':
-        return {'backend_type': 'duckdb', **DUCKDB_CONFIG}
-    elif backend == 'motherduck':
-        return {'backend_type': 'motherduck', **MOTHERDUCK_CONFIG}
-    elif backend == 'bigquery':
-        return {'backend_type': 'bigquery', **BIGQUERY_CONFIG}
-    else:
-        raise ValueError(f"Unknown storage backend: {backend}")
+    backend = backend_override.lower() if backend_override else _STORAGE_BACKEND_LOWER
+    return MappingProxyType({'backend_type': backend, **_backend_config(backend)})
 
 
 def get_storage_backend_instance():
@@ -93,50 +158,50 @@ def get_storage_backend_instance():
     """
     from util.storage_backend import get_storage_backend
     
-    backend = STORAGE_BACKEND.lower()
-    
-    if backend == 'sqlite':
-        return get_storage_backend(backend_type='sqlite', **SQLITE_CONFIG)
-    elif backend == 'duckdb':
-        return get_storage_backend(backend_type='duckdb', **DUCKDB_CONFIG)
-    elif backend == 'motherduck':
-        return get_storage_backend(backend_type='motherduck', **MOTHERDUCK_CONFIG)
-    elif backend == 'bigquery':
-        return get_storage_backend(backend_type='bigquery', **BIGQUERY_CONFIG)
-    else:
-        raise ValueError(f"Unknown storage backend: {backend}")
+    backend = _STORAGE_BACKEND_LOWER
+    return get_storage_backend(backend_type=backend, **_backend_config(backend))
 
 
 def print_config():
     """Print current configuration."""
     config = get_storage_config()
     backend = config['backend_type']
-    
-    print("=" * 60)
-    print("CURRENT CONFIGURATION")
-    print("=" * 60)
-    print(f"Storage Backend: {backend.upper()}")
-    
+    bar = "=" * 60
+
+    lines = [bar, "CURRENT CONFIGURATION", bar, f"Storage Backend: {backend.upper()}"]
+
     if backend == 'sqlite':
-        print(f"Database Path: {config['db_path']}")
-        print(f"Table Name: {config['table_name']}")
-        print("Note: SQLite is best for OLTP (transactions)")
+        lines += [
+            f"Database Path: {config['db_path']}",
+            f"Table Name: {config['table_name']}",
+            "Note: SQLite is best for OLTP (transactions)",
+        ]
     elif backend == 'duckdb':
-        print(f"Database Path: {config['db_path']}")
-        print(f"Table Name: {config['table_name']}")
-        print("Note: DuckDB is optimized for OLAP (analytics)")
+        lines += [
+            f"Database Path: {config['db_path']}",
+            f"Table Name: {config['table_name']}",
+            "Note: DuckDB is optimized for OLAP (analytics)",
+        ]
     elif backend == 'motherduck':
-        print(f"Database: {config['database']}")
-        print(f"Table Name: {config['table_name']}")
-        token_set = bool(os.getenv('MOTHERDUCK_TOKEN'))
-        print(f"Token set: {'✅ Yes' if token_set else '❌ No — set MOTHERDUCK_TOKEN'}")
-        print("Note: MotherDuck is cloud-hosted DuckDB")
+        token_set = bool(_env('MOTHERDUCK_TOKEN'))
+        lines += [
+            f"Database: {config['database']}",
+            f"Table Name: {config['table_name']}",
+            f"Token set: {'✅ Yes' if token_set else '❌ No — set MOTHERDUCK_TOKEN'}",
+            "Note: MotherDuck is cloud-hosted DuckDB",
+        ]
     elif backend == 'bigquery':
-        print(f"Dataset ID: {config['dataset_id']}")
-        print(f"Table Name: {config['table_name']}")
-        print(f"Buffer Size: {config['buffer_size']}")
-        print("Note: BigQuery is cloud-scale analytics")
-    
-    print(f"Days to look back: {DEFAULT_DAYS_BACK}")
-    print(f"Manila Bulletin sections: {MANILA_BULLETIN_SECTIONS}")
-    print("=" * 60)
\ No newline at end of file
+        lines += [
+            f"Dataset ID: {config['dataset_id']}",
+            f"Table Name: {config['table_name']}",
+            f"Buffer Size: {config['buffer_size']}",
+            "Note: BigQuery is cloud-scale analytics",
+        ]
+
+    lines += [
+        f"Days to look back: {DEFAULT_DAYS_BACK}",
+        f"Manila Bulletin sections: {MANILA_BULLETIN_SECTIONS}",
+        bar,
+    ]
+    # One write instead of a print per line
+    print("\n".join(lines))
@@ -8,15 +8,17 @@ import signal
 import sys
 from datetime import datetime, timedelta
 
-from news.apis import get_all_articles
-from news.crawler import refresh_news_articles, debug_article, resolve_unextracted_articles
-from util.backup import backup_to_local, restore_to_motherduck
 from config import get_storage_config, print_config, DEFAULT_DAYS_BACK
-from util.storage_backend import get_storage_backend
 from util.tools import setup_logger
 
+# Scraper, crawler, and storage modules are imported inside the branches
+# that use them, so each CLI mode only loads the dependencies it needs.
+
 logger = setup_logger()
 
+# Separator line for console banners
+_BAR = "=" * 60
+
 # Global reference to storage for signal handler
 storage_instance = None
 
@@ -24,9 +26,7 @@ storage_instance = None
 def signal_handler(sig, frame):
     """Handle shutdown signals (Ctrl+C, SIGTERM) gracefully."""
     signal_name = 'SIGINT' if sig == signal.SIGINT else 'SIGTERM'
-    logger.info(f"\n{'=' * 60}")
-    logger.info(f"Received {signal_name} - Shutting down gracefully...")
-    logger.info(f"{'=' * 60}")
+    logger.info(f"\n{_BAR}\nReceived {signal_name} - Shutting down gracefully...\n{_BAR}")
 
     if storage_instance:
         try:
@@ -48,6 +48,8 @@ def run_query(query: str, config: dict) -> None:
     results are printed as a DataFrame. Meant for quick ad-hoc data
     inspection from the CLI without needing a separate DB client.
     """
+    from util.storage_backend import get_storage_backend
+
     backend_type = config.get('backend_type', 'sqlite')
     kwargs = {k: v for k, v in config.items() if k != 'backend_type'}
 
@@ -61,9 +63,9 @@ def run_query(query: str, config: dict) -> None:
             print("Query returned no results.")
             return
 
-        # DuckDB/MotherDuck/BigQuery return a DataFrame; SQLite returns a list of tuples
-        import pandas as pd
-        if isinstance(results, pd.DataFrame):
+        # DuckDB/MotherDuck/BigQuery return a DataFrame; SQLite returns a list of tuples.
+        # Checked by duck typing so printing SQLite results never imports pandas.
+        if hasattr(results, 'to_string'):
             if results.empty:
                 print("Query returned 0 rows.")
             else:
@@ -166,8 +168,12 @@ def main():
 
     args = parser.parse_args()
 
+    # Single clock read shared by every date default below
+    now = datetime.now()
+    today_str = now.strftime('%Y-%m-%d')
+
     # ── Get storage config ──────────────────────────────────────────────────
-    config = get_storage_config(args.backend) if args.backend else get_storage_config()
+    config = get_storage_config(args.backend)
 
     if args.backend:
         print(f"Backend overridden to: {args.backend}")
@@ -184,33 +190,38 @@ def main():
 
     # ── --debug-url ─────────────────────────────────────────────────────────
     if args.debug_url:
+        from news.crawler import debug_article
         debug_article(args.debug_url)
         return
 
     # ── --backup ─────────────────────────────────────────────────────────────
     if args.backup:
+        from util.backup import backup_to_local
         backup_to_local()
         return
 
     # ── --restore ────────────────────────────────────────────────────────────
     if args.restore:
+        from util.backup import restore_to_motherduck
         restore_to_motherduck()
         return
 
     # ── --resolve-unextracted ─────────────────────────────────────────────────
     if args.resolve_unextracted:
+        from news.crawler import resolve_unextracted_articles
         resolve_unextracted_articles()
         return
 
     # ── --use-crawler ───────────────────────────────────────────────────────
     if args.use_crawler:
         import os
+        from news.crawler import refresh_news_articles
 
         # When run via GitHub Actions, CRAWL_START_DATE and CRAWL_END_DATE are
         # injected as environment variables by the workflow. When run locally,
         # these fall back to the defaults below.
         start_date = os.getenv('CRAWL_START_DATE', '2026-01-01')
-        end_date   = os.getenv('CRAWL_END_DATE',   datetime.today().strftime('%Y-%m-%d'))
+        end_date   = os.getenv('CRAWL_END_DATE',   today_str)
 
         logger.info(f"Crawler date range: {start_date} → {end_date}")
 
@@ -236,15 +247,18 @@ def main():
     # ── Default: run API scrapers ───────────────────────────────────────────
     if args.start_date:
         start_date = args.start_date
-    elif args.days_back:
-        start_date = (datetime.now() - timedelta(days=args.days_back)).strftime('%Y-%m-%d')
     else:
-        start_date = (datetime.now() - timedelta(days=DEFAULT_DAYS_BACK)).strftime('%Y-%m-%d')
+        days_back = args.days_back or DEFAULT_DAYS_BACK
+        start_date = (now - timedelta(days=days_back)).strftime('%Y-%m-%d')
+
+    print(
+        f"{_BAR}\n"
+        f"Fetching articles from {start_date}\n"
+        f"Using {config['backend_type'].upper()} storage\n"
+        f"{_BAR}"
+    )
 
-    print("=" * 60)
-    print(f"Fetching articles from {start_date}")
-    print(f"Using {config['backend_type'].upper()} storage")
-    print("=" * 60)
+    from news.apis import get_all_articles
 
     try:
         get_all_articles(
@@ -253,9 +267,7 @@ def main():
             **{k: v for k, v in config.items() if k != 'backend_type'}
         )
 
-        print("\n" + "=" * 60)
-        print("SCRAPING COMPLETED SUCCESSFULLY")
-        print("=" * 60)
+        print(f"\n{_BAR}\nSCRAPING COMPLETED SUCCESSFULLY\n{_BAR}")
 
     except KeyboardInterrupt:
         logger.info("\nInterrupted by user")
@@ -1,13 +1,22 @@
 import traceback
 import asyncio
 import aiohttp
+import collections
+import contextlib
+import functools
+import itertools
+import multiprocessing
+import os
+import sqlite3
 import sys
 
+from collections.abc import AsyncIterator, Iterator
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from datetime import datetime
-from urllib.parse import urlparse
+from typing import Any
 
 from util.tools import setup_logger, async_get, html_to_markdown
-from util.storage_backend import get_storage_backend, StorageBackend
+from util.storage_backend import get_storage_backend, StorageBackend, SQLITE_ROWS_PER_INSERT
 
 
 logger = setup_logger()
@@ -15,29 +24,301 @@ logger = setup_logger()
 # Global storage backend - will be set by get_all_articles
 storage: StorageBackend = None
 
+# Max in-flight detail requests per scraper, and rows per bulk insert.
+# Each scraper creates its own BoundedSemaphore per run (a module-level one would
+# stay bound to the first event loop); the shared connector's limit_per_host
+# caps sockets per site on top of that.
+DETAIL_CONCURRENCY = 32
+# One full multi-row SQLite INSERT per batch, rather than a full one plus a 1-row remainder
+INSERT_BATCH_SIZE = SQLITE_ROWS_PER_INSERT
 
-async def abscbn_articles(start_date: str) -> None:
+# A partial batch is written once no new row has arrived for this long
+WRITE_FLUSH_SECONDS = 1.0
+
+# Listing pages requested ahead of the one being processed. The window opens at
+# one page and widens once the caller has seen it (total count, short page), so
+# a one-page run sends no extra requests; a longer run without a page count can
+# still send up to LISTING_PREFETCH - 1 past the end, which are then cancelled.
+LISTING_PREFETCH = 4
+
+# Elements stripped from every article body before markdown conversion
+MEDIA_TAGS = ('img', 'figure', 'iframe')
+
+# ABS-CBN content API and public site roots
+ABSCBN_API_BASE = 'https://od2-content-api.abs-cbn.com/prod'
+ABSCBN_SITE_BASE = 'https://www.abs-cbn.com'
+
+# Worker processes for HTML -> markdown, created on first use
+_markdown_pool: ProcessPoolExecutor = None
+
+# Rows waiting for the shared storage writer, the writer task draining them, and
+# the one thread every blocking storage call runs on — set while _row_writer() is active
+_write_queue: asyncio.Queue = None
+_writer_task: asyncio.Task = None
+_storage_executor: ThreadPoolExecutor = None
+
+# Tag id -> slug lookups persisted across runs; a tag's slug doesn't change, so
+# a re-run only fetches tags it has never seen
+TAG_CACHE_PATH = os.getenv('TAG_CACHE_PATH', 'tag_cache.db')
+
+
+async def _to_markdown(html_content: str) -> str:
+    """
+    Convert an article body in a worker process.
+    Parsing is CPU-bound; running it here keeps the event loop free to service
+    other responses, and lets conversions use more than one core.
+    """
+    global _markdown_pool
+    if _markdown_pool is None:
+        # Never fork: by the first conversion the storage thread and aiohttp's
+        # resolver threads exist, and forking a multithreaded process can leave
+        # a worker deadlocked on a lock one of them held. forkserver (or spawn,
+        # where it is unavailable) starts workers from a clean process instead.
+        method = 'forkserver' if 'forkserver' in multiprocessing.get_all_start_methods() else 'spawn'
+        _markdown_pool = ProcessPoolExecutor(mp_context=multiprocessing.get_context(method))
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(
+        _markdown_pool,
+        functools.partial(html_to_markdown, html_content, unwanted_tags=MEDIA_TAGS),
+    )
+
+
+def _prefetch(session: aiohttp.ClientSession, url: str, params: dict) -> tuple[dict, dict, asyncio.Task]:
+    """
+    Start fetching a listing page in the background.
+    Returns (params, headers, task); headers is filled in once the page arrives.
+    """
+    headers = {}
+    task = asyncio.create_task(async_get(session, url, params=dict(params), response_headers=headers))
+    return params, headers, task
+
+
+async def _listing_pages(
+        session: aiohttp.ClientSession,
+        url: str,
+        page_params: Iterator[dict],
+        depth: int = LISTING_PREFETCH) -> AsyncIterator[tuple[dict, Any, dict]]:
+    """
+    Yield (params, response, headers) for successive listing pages, in order,
+    keeping up to depth requests in flight so later pages download while the
+    current one is processed. Requests still pending when the caller stops are
+    cancelled.
+
+    page_params is advanced only after the caller has handled each page, so a
+    lazy iterator can stop paging on what earlier responses revealed (e.g. a
+    total page count). For the same reason the first page is requested alone,
+    and the window only fills to depth once the caller has seen it.
+    """
+    window = collections.deque(
+        _prefetch(session, url, params) for params in itertools.islice(page_params, 1)
+    )
+    try:
+        while window:
+            params, headers, page = window.popleft()
+            yield params, await page, headers
+            for more in itertools.islice(page_params, depth - len(window)):
+                window.append(_prefetch(session, url, more))
+    finally:
+        for _, _, page in window:
+            if not page.cancel() and not page.cancelled():
+                # Already finished (e.g. failed past the last page) — retrieve the
+                # result so asyncio doesn't warn about an unobserved exception
+                page.exception()
+
+
+async def _storage_call(method, *args):
+    """
+    Run a blocking storage method on the storage thread, keeping the event loop
+    free while it works. A single thread serialises every call, so backends
+    whose connection can't be used concurrently (SQLite, DuckDB) stay safe.
+    """
+    return await asyncio.get_running_loop().run_in_executor(_storage_executor, method, *args)
+
+
+async def _write_rows(queue: asyncio.Queue) -> None:
+    """
+    Single storage writer shared by all scrapers. Rows from every site are
+    merged into INSERT_BATCH_SIZE batches, with a partial batch flushed after
+    WRITE_FLUSH_SECONDS of quiet. A None item flushes and stops the writer.
+    """
+    batch = []
+    try:
+        while True:
+            try:
+                row = await asyncio.wait_for(queue.get(), timeout=WRITE_FLUSH_SECONDS)
+            except asyncio.TimeoutError:
+                if batch:
+                    await _storage_call(storage.insert_many, batch)
+                    batch = []
+                continue
+            if row is None:
+                break
+            batch.append(row)
+            if len(batch) >= INSERT_BATCH_SIZE:
+                await _storage_call(storage.insert_many, batch)
+                batch = []
+    finally:
+        if batch:
+            await _storage_call(storage.insert_many, batch)
+
+
+@contextlib.asynccontextmanager
+async def _row_writer():
+    """Run the shared storage writer and its storage thread for the duration of the block."""
+    global _write_queue, _writer_task, _storage_executor
+    _storage_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='storage')
+    # Bounded, so scrapers wait for storage instead of piling rows up in memory
+    queue = asyncio.Queue(maxsize=INSERT_BATCH_SIZE * 4)
+    writer = asyncio.create_task(_write_rows(queue))
+    _write_queue, _writer_task = queue, writer
+    try:
+        yield
+    finally:
+        _write_queue = _writer_task = None
+        try:
+            if not writer.done():
+                await queue.put(None)
+            await writer
+        finally:
+            _storage_executor.shutdown()
+            _storage_executor = None
+
+
+async def _enqueue_row(row: dict) -> None:
+    """
+    Put a row on the writer's queue, raising instead of blocking forever if the
+    writer has stopped (e.g. a failed write) and nothing will drain the queue.
+    """
+    queue, writer = _write_queue, _writer_task
+    if not writer.done():
+        if not queue.full():
+            queue.put_nowait(row)
+            return
+        put = asyncio.ensure_future(queue.put(row))
+        await asyncio.wait((put, writer), return_when=asyncio.FIRST_COMPLETED)
+        if put.done():
+            return
+        put.cancel()
+    error = None if writer.cancelled() else writer.exception()
+    raise RuntimeError('Storage writer stopped; no more rows can be stored') from error
+
+
+async def _store_rows(source: str, rows: AsyncIterator[dict]) -> None:
+    """
+    Hand a scraper's row stream to the storage writer as rows arrive, so memory
+    stays bounded and the scraper never waits on a page-sized write.
+    """
+    if _write_queue is None:
+        # Scraper run on its own, outside get_all_articles_async
+        async with _row_writer():
+            return await _store_rows(source, rows)
+
+    queued = 0
+    async for row in rows:
+        await _enqueue_row(row)
+        queued += 1
+    logger.info(f'Queued {queued} new {source} articles for storage.')
+
+
+def _load_tag_slugs(source: str) -> dict[int, str]:
+    """Read the tag slugs cached on disk for a source (empty if unavailable)."""
+    try:
+        with contextlib.closing(sqlite3.connect(TAG_CACHE_PATH)) as conn, conn:
+            conn.execute(
+                'CREATE TABLE IF NOT EXISTS tag_cache ('
+                'source TEXT, tag_id INTEGER, slug TEXT, PRIMARY KEY (source, tag_id))'
+            )
+            return dict(conn.execute('SELECT tag_id, slug FROM tag_cache WHERE source = ?', (source,)))
+    except sqlite3.Error as e:
+        logger.warning(f'Tag cache unavailable, fetching all {source} tags: {e}')
+        return {}
+
+
+def _save_tag_slugs(source: str, slugs: dict[int, str]) -> None:
+    """Add newly fetched tag slugs for a source to the on-disk cache."""
+    if not slugs:
+        return
+    try:
+        with contextlib.closing(sqlite3.connect(TAG_CACHE_PATH)) as conn, conn:
+            conn.executemany(
+                'INSERT OR IGNORE INTO tag_cache (source, tag_id, slug) VALUES (?, ?, ?)',
+                ((source, tag_id, slug) for tag_id, slug in slugs.items()),
+            )
+    except sqlite3.Error as e:
+        logger.warning(f'Could not save {len(slugs)} {source} tags to cache: {e}')
+
+
+async def _mark_stored(record_ids: list[str], seen: set) -> None:
+    """
+    Add the ids among record_ids that are already in storage to seen, using one
+    query per page instead of one per article.
+
+    seen holds every id a scraper should skip: stored ones, plus ones picked up
+    earlier in this run — streamed rows can still be waiting in an unflushed
+    batch, so storage alone can't tell.
+    """
+    unseen = [record_id for record_id in record_ids if record_id not in seen]
+    if unseen:
+        seen.update(await _storage_call(storage.existing_ids, unseen))
+
+
+async def abscbn_articles(session: aiohttp.ClientSession, start_date: str) -> None:
     """
     Fetches and stores ABS-CBN news articles published since a given start date.
     Skips articles that already exist in storage.
     """
-    url = 'https://od2-content-api.abs-cbn.com/prod/latest'
+    await _store_rows('ABS-CBN', _abscbn_rows(session, start_date))
+
+
+async def _abscbn_rows(session: aiohttp.ClientSession, start_date: str) -> AsyncIterator[dict]:
+    """Yield new ABS-CBN article rows, newest first, as their details arrive."""
+    url = f'{ABSCBN_API_BASE}/latest'
     limit = 100
-    offset = 0
     params = {
         'brand': 'OD',
         'partner': 'imp-01',
         'limit': limit,
-        'offset': offset,
     }
-    start_date = datetime.strptime(start_date, '%Y-%m-%d')
-    created_date = datetime.now()
-    article_info_base_url = 'https://od2-content-api.abs-cbn.com/prod/item?url='
-
-    async with aiohttp.ClientSession() as session:
-        while created_date >= start_date:
-            params['offset'] = offset
-            data = await async_get(session, url, params=params)
+    # Normalised 'YYYY-MM-DD' — fixed-width ISO timestamps sort chronologically
+    # as plain strings, so the date filter below needs no parsing
+    start_key = datetime.strptime(start_date, '%Y-%m-%d').strftime('%Y-%m-%d')
+    article_info_base_url = f'{ABSCBN_API_BASE}/item?url='
+    detail_sem = asyncio.BoundedSemaphore(DETAIL_CONCURRENCY)
+    seen = set()
+
+    async def fetch_detail(item, created_full):
+        if item.get('body_html'):
+            # Listing already carries the body — skip the detail round-trip
+            body_html = item['body_html']
+        else:
+            async with detail_sem:
+                detail = await async_get(
+                    session,
+                    url=f"{article_info_base_url}{item.get('slugline_url', 'no_url')}",
+                )
+            body_html = detail['data'].get('body_html') if detail.get('data') else 'No content found'
+        date = created_full[:10]
+        return {
+            'id': item.get('_id'),
+            'source': 'abs-cbn',
+            'url': f"{ABSCBN_SITE_BASE}/{item.get('slugline_url')}",
+            'category': (item.get('category') or '').upper(),
+            'title': item.get('title'),
+            'author': item.get('author'),
+            # Fixed-width ISO string: slice out the fields instead of parsing
+            'date': date,
+            'publish_time': f'{date} {created_full[11:19]}',
+            'tags': item.get('tags'),
+            # Converted outside the semaphore so the slot goes to the next download
+            'cleaned_content': await _to_markdown(body_html),
+        }
+
+    pages = _listing_pages(
+        session, url, ({**params, 'offset': offset} for offset in itertools.count(0, limit))
+    )
+    async with contextlib.aclosing(pages):
+        async for page_params, data, _ in pages:
+            offset = page_params['offset']
             articles = data.get('listItem', [])
             logger.info(f'Fetched {len(articles)} articles from ABS-CBN. Offset: {offset}')
 
@@ -46,100 +327,87 @@ async def abscbn_articles(start_date: str) -> None:
                 break
 
             # Filter articles by date and skip existing records
+            await _mark_stored([str(a.get('_id')) for a in articles], seen)
             filtered_articles = []
             reached_old = False
             for article in articles:
-                created_date = datetime.strptime(
-                    article.get('createdDateFull', ''),
-                    '%Y-%m-%dT%H:%M:%S.%fZ')
-                if created_date < start_date:
+                # createdDateFull is ISO 8601 ('2024-05-01T10:20:30.123Z')
+                created_full = article.get('createdDateFull') or ''
+                if len(created_full) < 10 or not created_full[:4].isdigit():
+                    # Would sort before start_key and end paging — skip just this item
+                    logger.warning(
+                        f"Skipping ABS-CBN article {article.get('_id')} with unusable "
+                        f"createdDateFull: {created_full!r}"
+                    )
+                    continue
+                if created_full < start_key:
                     logger.info('Reached ABS-CBN articles older than start_date.')
                     reached_old = True
                     break
                 # Skip if already in DB — no point fetching the detail page
-                if storage.record_exists(str(article.get('_id'))):
-                    logger.debug(f'Skipping existing ABS-CBN record: {article.get("_id")}')
+                article_id = str(article.get('_id'))
+                if article_id in seen:
+                    logger.debug(f'Skipping existing ABS-CBN record: {article_id}')
                     continue
-                filtered_articles.append((article, created_date))
+                seen.add(article_id)
+                filtered_articles.append((article, created_full))
 
             if not filtered_articles:
                 if reached_old:
                     break
-                offset += limit
                 continue
 
-            # Fetch all article details concurrently
+            # Fetch article details concurrently (bounded) and process each one as
+            # soon as it arrives instead of waiting for the slowest of the page
             tasks = [
-                async_get(
-                    session,
-                    url=article_info_base_url + item.get('slugline_url', 'no_url'),
-                    id=item.get('_id'),
-                    source='abs-cbn',
-                    slugline_url=item.get('slugline_url'),
-                    category=item.get('category').upper(),
-                    title=item.get('title'),
-                    author=item.get('author'),
-                    date=cd.strftime('%Y-%m-%d'),
-                    publish_time=cd.strftime('%Y-%m-%d %H:%M:%S'),
-                    tags=item.get('tags'),
-                )
-                for item, cd in filtered_articles if item.get('slugline_url')
+                fetch_detail(item, created_full)
+                for item, created_full in filtered_articles if item.get('slugline_url')
             ]
-            details = await asyncio.gather(*tasks)
 
-            inserted = 0
-            for article in details:
-                article_content = html_to_markdown(
-                    article['data'].get('body_html') if article.get('data') else 'No content found',
-                    unwanted_tags=['img', 'figure', 'iframe']
-                )
-                storage.insert_record({
-                    'id': article.get('id'),
-                    'source': article.get('source'),
-                    'url': 'https://www.abs-cbn.com/' + article.get('slugline_url'),
-                    'category': article.get('category'),
-                    'title': article.get('title'),
-                    'author': article.get('author'),
-                    'date': article.get('date'),
-                    'publish_time': article.get('publish_time'),
-                    'tags': article.get('tags'),
-                    'cleaned_content': article_content,
-                })
-                inserted += 1
-
-            logger.info(f'Inserted {inserted} new ABS-CBN articles.')
+            for next_row in asyncio.as_completed(tasks):
+                yield await next_row
 
             if reached_old:
                 break
 
-            offset += limit
-
 
-async def manila_bulletin_articles(start_date: str, section_ids: list = None) -> None:
+async def manila_bulletin_articles(session: aiohttp.ClientSession, start_date: str, section_ids: list = None) -> None:
     """
     Fetches articles from Manila Bulletin's API.
     - Skips detail API calls for articles already in storage.
     - Stops pagination early when all articles on a page already exist (caught up).
     - Stops pagination when articles older than start_date are found.
     """
+    await _store_rows('Manila Bulletin', _manila_bulletin_rows(session, start_date, section_ids))
+    logger.info('Completed fetching all Manila Bulletin articles.')
+
+
+async def _manila_bulletin_rows(
+        session: aiohttp.ClientSession, start_date: str, section_ids: list = None) -> AsyncIterator[dict]:
+    """Yield new Manila Bulletin article rows, section by section."""
     if section_ids is None:
         section_ids = [25, 26, 27, 28, 29, 30, 31]
 
     start_datetime = datetime.strptime(start_date, '%Y-%m-%d')
-
-    async with aiohttp.ClientSession() as session:
-        for section_id in section_ids:
-            page = 1
-            logger.info(f'Fetching Manila Bulletin section_id: {section_id}')
-
-            while True:
-                try:
-                    response = await async_get(
-                        session,
-                        'https://mb.com.ph/api/pb/fetch-articles-paginated',
-                        params={'page': page, 'section_id': section_id}
-                    )
-
+    listing_url = 'https://mb.com.ph/api/pb/fetch-articles-paginated'
+    detail_sem = asyncio.BoundedSemaphore(DETAIL_CONCURRENCY)
+    seen = set()
+
+    for section_id in section_ids:
+        page = 1
+        logger.info(f'Fetching Manila Bulletin section_id: {section_id}')
+
+        # Shallow window: on incremental runs a section is usually caught up
+        # within its first page or two, and every read-ahead past that is wasted
+        pages = _listing_pages(
+            session, listing_url,
+            ({'page': page, 'section_id': section_id} for page in itertools.count(1)),
+            depth=2,
+        )
+        try:
+            async with contextlib.aclosing(pages):
+                async for page_params, response, _ in pages:
+                    page = page_params['page']
                     if not response or response.get('response') != 'success':
                         logger.warning(f'No response for section {section_id}, page {page}')
                         break
@@ -159,7 +427,7 @@ async def manila_bulletin_articles(start_date: str, section_ids: list = None) ->
                         publish_time = article.get('publish_time', '')
                         if not publish_time:
                             continue
-                        article_datetime = datetime.strptime(publish_time, '%Y-%m-%d %H:%M:%S')
+                        article_datetime = datetime.fromisoformat(publish_time)
 
                         if article_datetime < start_datetime:
                             # Articles are newest-first — everything after this is older
@@ -174,10 +442,9 @@ async def manila_bulletin_articles(start_date: str, section_ids: list = None) ->
 
                     # ── Caught-up check: if every article on this page already exists,
                     #    there's nothing new to fetch — stop this section entirely. ──
-                    all_exist = all(
-                        storage.record_exists(str(a.get('cms_article_id')))
-                        for a in filtered_articles
-                    )
+                    page_ids = [str(a.get('cms_article_id')) for a in filtered_articles]
+                    await _mark_stored(page_ids, seen)
+                    all_exist = all(cms_id in seen for cms_id in page_ids)
                     if all_exist:
                         logger.info(
                             f'All {len(filtered_articles)} articles on page {page} '
@@ -191,138 +458,211 @@ async def manila_bulletin_articles(start_date: str, section_ids: list = None) ->
                         if not cms_id:
                             return None
                         # Skip expensive detail call if already stored
-                        if storage.record_exists(str(cms_id)):
+                        if str(cms_id) in seen:
                             logger.debug(f'Skipping existing MB record: {cms_id}')
                             return None
+                        seen.add(str(cms_id))
                         try:
-                            detail = await async_get(
-                                session,
-                                f'https://mb.com.ph/api/pb/article/{cms_id}'
-                            )
+                            async with detail_sem:
+                                detail = await async_get(
+                                    session,
+                                    f'https://mb.com.ph/api/pb/article/{cms_id}'
+                                )
                             if detail and detail.get('response') == 'success':
-                                return detail.get('data', {})
+                                article_data = detail.get('data', {})
+                                article_data['cleaned_content'] = await _to_markdown(
+                                    article_data.get('body', '') or article_data.get('summary', 'No content found')
+                                )
+                                return article_data
                         except Exception as e:
-                            logger.error(f'Failed to fetch detail for cms_id {cms_id}: {e}')
+                            logger.error(f'Failed to fetch or convert detail for cms_id {cms_id}: {e}')
                         return None
 
                     details = await asyncio.gather(*[fetch_detail(a) for a in filtered_articles])
 
-                    inserted = 0
                     for article_data in details:
                         if not article_data:
                             continue
                         try:
-                            article_content = html_to_markdown(
-                                article_data.get('body', '') or article_data.get('summary', 'No content found'),
-                                unwanted_tags=['img', 'figure', 'iframe']
-                            )
                             tags_raw = article_data.get('cf_article_tags', '')
+                            # Strip each tag once; filter(None) drops the empty ones
                             tags = ','.join(
-                                t.strip() for t in tags_raw.split(',') if t.strip()
+                                filter(None, map(str.strip, tags_raw.split(',')))
                             ) if isinstance(tags_raw, str) else ''
+                            publish_time = article_data.get('publish_time', '')
 
-                            storage.insert_record({
+                            row = {
                                 'id': article_data.get('cms_article_id'),
                                 'source': 'manila_bulletin',
                                 'url': article_data.get('link', ''),
                                 'category': article_data.get('section_name', 'Unknown'),
                                 'title': article_data.get('title', 'No title found'),
                                 'author': article_data.get('author_name', 'Unknown'),
-                                'date': article_data.get('publish_time', '').split(' ')[0],
-                                'publish_time': article_data.get('publish_time', ''),
+                                'date': publish_time.split(' ')[0],
+                                'publish_time': publish_time,
                                 'tags': tags,
-                                'cleaned_content': article_content,
-                            })
-                            inserted += 1
+                                'cleaned_content': article_data['cleaned_content'],
+                            }
                         except Exception as e:
-                            logger.error(f'Error inserting MB article {article_data.get("cms_article_id")}: {e}')
+                            logger.error(f'Error preparing MB article {article_data.get("cms_article_id")}: {e}')
                             logger.error(traceback.format_exc())
-
-                    logger.info(f'Inserted {inserted} new articles — section: {section_id}, page: {page}')
+                            continue
+                        yield row
 
                     if reached_old_articles:
                         logger.info(f'Reached old articles in section {section_id}. Moving on.')
                         break
 
-                    page += 1
-                    await asyncio.sleep(0.5)
+        except Exception as e:
+            logger.error(f'Error on section {section_id}, page {page}: {e}')
+            logger.error(traceback.format_exc())
 
-                except Exception as e:
-                    logger.error(f'Error on section {section_id}, page {page}: {e}')
-                    logger.error(traceback.format_exc())
-                    break
-
-    logger.info('Completed fetching all Manila Bulletin articles.')
 
-
-async def rappler_articles(start_date: str) -> None:
+async def rappler_articles(session: aiohttp.ClientSession, start_date: str) -> None:
     """
     Fetches articles from Rappler's API.
     Skips articles already present in storage.
     """
+    await _store_rows('Rappler', _rappler_rows(session, start_date))
+
+
+async def _rappler_rows(session: aiohttp.ClientSession, start_date: str) -> AsyncIterator[dict]:
+    """Yield new Rappler article rows, one listing page at a time."""
     url = 'https://www.rappler.com/wp-json/wp/v2/posts'
     page = 1
     params = {
-        'page': page,
         'per_page': 10,
         'after': datetime.strptime(start_date, '%Y-%m-%d').isoformat(),
     }
 
-    async with aiohttp.ClientSession() as session:
-        while True:
-            try:
-                params['page'] = page
-                articles = await async_get(session, url, params=params)
+    detail_sem = asyncio.BoundedSemaphore(DETAIL_CONCURRENCY)
+    # tag id -> slug, seeded from the on-disk cache; new_slugs collects the ones
+    # fetched this run so they can be written back
+    tag_slugs = await asyncio.to_thread(_load_tag_slugs, 'rappler')
+    new_slugs: dict[int, str] = {}
+    # tag id -> lookup task for tags not cached yet. The same few tags recur across
+    # most articles, so each is fetched once; concurrent articles share the request.
+    tag_cache: dict[int, asyncio.Task] = {}
+    seen = set()
+    # From the first page's X-WP-TotalPages header; until then, page on
+    total_pages = None
+
+    def listing_params():
+        for page in itertools.count(1):
+            # WordPress answers 400 past the last page, so don't ask for it
+            if total_pages is not None and page > total_pages:
+                return
+            yield {**params, 'page': page}
+
+    async def fetch_tag(tag_id):
+        async with detail_sem:
+            tag = await async_get(session, url=f'https://www.rappler.com/wp-json/wp/v2/tags/{tag_id}')
+        tag_slugs[tag_id] = new_slugs[tag_id] = tag.get('slug', '')
+
+    def get_tag(tag_id) -> asyncio.Task:
+        task = tag_cache.get(tag_id)
+        if task is None:
+            task = tag_cache[tag_id] = asyncio.create_task(fetch_tag(tag_id))
+        return task
+
+    async def build_row(article):
+        article_id = str(article.get('id'))
+        # 'YYYY-MM-DDTHH:MM:SS' (checked by the caller) — fixed width, so slicing
+        # replaces parse + strftime
+        published = article['date']
+        link = article.get('link') or ''
+        tag_ids = article.get('tags', [])
+        # Lookups are already-scheduled tasks, so awaiting them in turn needs no
+        # gather wrapper — and the body converts while they are still in flight
+        lookups = [get_tag(tag_id) for tag_id in tag_ids if tag_id not in tag_slugs]
+        article_content = await _to_markdown(
+            article.get('content', {}).get('rendered', 'No content found')
+        )
+        for lookup in lookups:
+            await lookup
+        return {
+            'id': article_id,
+            'source': 'rappler',
+            'url': link,
+            # 'https://www.rappler.com/<category>/...' — the first path segment,
+            # sliced out without building a ParseResult per article
+            'category': link.split('/', 4)[3].partition('?')[0],
+            'title': article.get('title', {}).get('rendered', 'No title found'),
+            'author': None,
+            'date': published[:10],
+            'publish_time': f'{published[:10]} {published[11:19]}',
+            'tags': ','.join(tag_slugs[tag_id] for tag_id in tag_ids),
+            'cleaned_content': article_content,
+        }
+
+    pages = _listing_pages(session, url, listing_params())
+    try:
+        async with contextlib.aclosing(pages):
+            async for page_params, articles, headers in pages:
+                page = page_params['page']
+                if total_pages is None and headers.get('x-wp-totalpages', '').isdigit():
+                    total_pages = int(headers['x-wp-totalpages'])
                 logger.info(f'Fetched {len(articles)} articles from Rappler. Page: {page}')
 
-                inserted = 0
+                await _mark_stored([str(a.get('id')) for a in articles], seen)
+                new_articles = []
                 for article in articles:
-                    article_id = str(article.get('id'))
-
                     # Skip if already stored
-                    if storage.record_exists(article_id):
+                    article_id = str(article.get('id'))
+                    if article_id in seen:
                         logger.debug(f'Skipping existing Rappler article: {article_id}')
                         continue
+                    seen.add(article_id)
+                    # build_row slices date and time out of 'YYYY-MM-DDTHH:MM:SS'
+                    published = article.get('date') or ''
+                    if len(published) < 19 or not published[:4].isdigit():
+                        logger.warning(f'Skipping Rappler article {article_id} with unusable date: {published!r}')
+                        continue
+                    new_articles.append(article)
+
+                # Build the whole page concurrently instead of one article's tags at a time
+                async with asyncio.TaskGroup() as tg:
+                    row_tasks = [tg.create_task(build_row(a)) for a in new_articles]
+                for task in row_tasks:
+                    yield task.result()
+
+                # A short page, or the last one X-WP-TotalPages counts, ends the
+                # listing. Stop here rather than reading past the end, which
+                # WordPress answers with a 400 — pages already prefetched beyond
+                # it (the first window goes out before the count is known) are
+                # cancelled when the loop exits.
+                if len(articles) < params['per_page'] or (total_pages is not None and page >= total_pages):
+                    logger.info('No more Rappler articles found.')
+                    break
 
-                    article_content = html_to_markdown(
-                        article.get('content', {}).get('rendered', 'No content found'),
-                        unwanted_tags=['img', 'figure', 'iframe']
-                    )
-                    tags_tasks = [
-                        async_get(session, url=f'https://www.rappler.com/wp-json/wp/v2/tags/{tag_id}')
-                        for tag_id in article.get('tags', [])
-                    ]
-                    tags = await asyncio.gather(*tags_tasks)
-
-                    storage.insert_record({
-                        'id': article_id,
-                        'source': 'rappler',
-                        'url': article.get('link'),
-                        'category': urlparse(article.get('link')).path.split('/')[1],
-                        'title': article.get('title', {}).get('rendered', 'No title found'),
-                        'author': None,
-                        'date': article.get('date').split('T')[0],
-                        'publish_time': datetime.strptime(
-                            article.get('date', ''),
-                            '%Y-%m-%dT%H:%M:%S').strftime('%Y-%m-%d %H:%M:%S'),
-                        'tags': ','.join(tag.get('slug', '') for tag in tags if tag),
-                        'cleaned_content': article_content,
-                    })
-                    inserted += 1
-
-                logger.info(f'Inserted {inserted} new Rappler articles on page {page}.')
-                page += 1
-                await asyncio.sleep(0.5)
-
-            except Exception as e:
-                logger.error('############ Rappler Error ############')
-                logger.error(e)
-                logger.error(traceback.format_exc())
-                break
+    except Exception as e:
+        logger.error('############ Rappler Error ############')
+        logger.error(e)
+        logger.error(traceback.format_exc())
+
+    finally:
+        # Also reached when the generator is closed or cancelled from outside:
+        # drop tag lookups left in flight, and keep the slugs learned so far
+        for task in tag_cache.values():
+            task.cancel()
+        await asyncio.to_thread(_save_tag_slugs, 'rappler', new_slugs)
 
 
 async def get_all_articles_async(start_date: str, backend: str = 'sqlite', **backend_kwargs) -> None:
-    global storage
+    global storage, _markdown_pool
+
+    # Validate once, before storage is opened, so a bad date fails fast with one
+    # error instead of opening a connection and then failing inside every scraper
+    try:
+        start_date = datetime.strptime(start_date, '%Y-%m-%d').strftime('%Y-%m-%d')
+    except ValueError:
+        raise ValueError(f"start_date must be 'YYYY-MM-DD', got {start_date!r}") from None
+
+    if hasattr(asyncio, 'eager_task_factory'):
+        # Python 3.12+: a task starts running as soon as it is created, so one that
+        # never blocks (a skipped detail, a settled tag lookup) finishes without a
+        # round trip through the event loop's ready queue
+        asyncio.get_running_loop().set_task_factory(asyncio.eager_task_factory)
 
     storage = get_storage_backend(backend, **backend_kwargs)
     logger.info(f'Using {backend} storage backend')
@@ -330,16 +670,47 @@ async def get_all_articles_async(start_date: str, backend: str = 'sqlite', **bac
     if 'main' in sys.modules:
         sys.modules['main'].storage_instance = storage
 
+    # One session for all scrapers so they share the connection pool and DNS cache.
+    # Cap per-host sockets so one site's fan-out can't starve the others, and keep
+    # idle connections alive across the gaps between listing pages.
+    connector = aiohttp.TCPConnector(
+        limit=64,
+        limit_per_host=DETAIL_CONCURRENCY,
+        ttl_dns_cache=300,
+        keepalive_timeout=60,
+    )
+    timeout = aiohttp.ClientTimeout(total=30, sock_connect=10)
     try:
-        await asyncio.gather(
-            abscbn_articles(start_date),
-            rappler_articles(start_date),
-            manila_bulletin_articles(start_date)
-        )
+        async with _row_writer(), aiohttp.ClientSession(connector=connector, timeout=timeout) as session:
+            scrapers = {
+                'abs-cbn': abscbn_articles(session, start_date),
+                'rappler': rappler_articles(session, start_date),
+                'manila_bulletin': manila_bulletin_articles(session, start_date),
+            }
+            # return_exceptions: one failing site must not leave the others
+            # running while storage is closed underneath them
+            results = await asyncio.gather(*scrapers.values(), return_exceptions=True)
+            for source, result in zip(scrapers, results):
+                if isinstance(result, Exception):
+                    logger.error(f'{source} scraper failed: {result}')
     finally:
-        storage.close()
+        if _markdown_pool is not None:
+            _markdown_pool.shutdown()
+            _markdown_pool = None
+        # Awaited, so a backend's own background writer (BigQuery) finishes its
+        # final flush before asyncio.run tears the loop down
+        await storage.aclose()
 
 
 def get_all_articles(start_date: str, backend: str = 'sqlite', **backend_kwargs) -> None:
     """Fetch articles from all sources and store using the specified backend."""
-    asyncio.run(get_all_articles_async(start_date, backend, **backend_kwargs))
\ No newline at end of file
+    try:
+        # Optional libuv-based loop: cheaper task switching and socket handling
+        # for the scrapers' fan-out. Falls back to the stock loop if missing.
+        import uvloop
+        loop_factory = uvloop.new_event_loop
+    except ImportError:
+        loop_factory = None
+
+    with asyncio.Runner(loop_factory=loop_factory) as runner:
+        runner.run(get_all_articles_async(start_date, backend, **backend_kwargs))
\ No newline at end of file
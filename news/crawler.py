@@ -1,6 +1,8 @@
+import itertools
 import os
-from typing import Dict, Any
-from dotenv import load_dotenv
+import re
+from collections import defaultdict
+from typing import Dict, Any, Iterator
 from datetime import datetime, timedelta
 import traceback
 import scrapy
@@ -8,12 +10,12 @@ from scrapy.crawler import CrawlerProcess
 from twisted.internet import defer
 from urllib.parse import urlparse
 
-from util.tools import setup_logger
+from util.tools import load_env, setup_logger
 from util.storage_backend import get_storage_backend
 from news.items import ArticleItem
 
 # Load environment variables from .env file
-load_dotenv()
+load_env()
 STORAGE_BACKEND = os.getenv('STORAGE_BACKEND', 'duckdb')
 
 logger = setup_logger()
@@ -21,21 +23,142 @@ logger = setup_logger()
 
 # ── SHARED HELPERS (module-level so both spiders can use them) ─────────────────
 
+# scheme://<subdomain>.<origin>.../<article_id>/<slug>/?query#fragment, in one match:
+# the first two host labels, then the path with its outer slashes stripped and
+# split once — the same fields urlparse + split produced, without the extra copies
+_INQ_ART_URL_RE = re.compile(
+    r'[^:/?#]+://(?P<subdomain>[^./?#]*)\.?(?P<origin>[^./?#]*)[^/?#]*'
+    r'/*(?P<article_id>[^/?#]*)/?(?P<slug>[^?#]*?)/*(?:[?#].*)?',
+    re.DOTALL,
+)
+
+
 def _parse_inq_art_url(url: str) -> dict:
-    parsed = urlparse(url)
-    parts = parsed.netloc.split('.')
-    subdomain = parts[0]
-    origin = parts[1] if len(parts) > 1 else ''
-    path_parts = parsed.path.strip('/').split('/', 1)
-    article_id = path_parts[0] if path_parts else ''
-    slug = path_parts[1] if len(path_parts) > 1 else ''
-    return {'subdomain': subdomain, 'origin': origin, 'article_id': article_id, 'slug': slug}
+    match = _INQ_ART_URL_RE.fullmatch(url)
+    if match is None:
+        raise ValueError(f'Not an absolute article URL: {url!r}')
+    return match.groupdict()
+
+
+# Article body container per subdomain; everything else uses _DEFAULT_CONTENT_SELECTOR
+_CONTENT_SELECTORS = {
+    'lifestyle': 'div.elementor-widget-theme-post-content',
+    'pop': 'div#TO_target_content',
+    'cebudailynews': 'div#article-content',
+    'usa': 'div#TO_target_content',
+}
+_DEFAULT_CONTENT_SELECTOR = 'div#FOR_target_content'
+
+# 'Thu, 09 May 2024 17:00:00' — the RFC 2822-style meta date, matched with one
+# compiled regex instead of strptime re-reading its format string per article
+_RFC_DATETIME_RE = re.compile(
+    r'(?:mon|tue|wed|thu|fri|sat|sun), (\d{1,2}) ([a-z]{3}) (\d{4}) (\d{1,2}):(\d{1,2}):(\d{1,2})',
+    re.IGNORECASE,
+)
+_MONTHS = {
+    name: number for number, name in enumerate(
+        ('jan', 'feb', 'mar', 'apr', 'may', 'jun', 'jul', 'aug', 'sep', 'oct', 'nov', 'dec'),
+        start=1,
+    )
+}
+
+
+# Every <meta> the extractors read, as (attribute, value) pairs
+_META_KEYS = frozenset({
+    ('property', 'og:title'),
+    ('name', 'author'),
+    ('name', 'twitter:data1'),
+    ('property', 'article:author'),
+    ('property', 'article:published_time'),
+    ('name', 'parsely-pub-date'),
+})
+_META_XPATH = '//meta[{}]'.format(' or '.join(f"@{attr}='{value}'" for attr, value in sorted(_META_KEYS)))
+
+
+def _meta_contents(response) -> dict[tuple[str, str], list[str]]:
+    """
+    Collect the content of every meta tag in _META_KEYS with one XPath walk,
+    keyed by (attribute, value) in document order — instead of each extractor
+    running its own full-document selector per tag.
+    """
+    contents = defaultdict(list)
+    for node in response.xpath(_META_XPATH):
+        content = node.attrib.get('content')
+        if content is None:
+            continue
+        for attr in ('property', 'name'):
+            key = (attr, node.attrib.get(attr))
+            if key in _META_KEYS:
+                contents[key].append(content)
+    return contents
+
+
+def _first_meta(meta: dict, *keys: tuple[str, str]) -> str | None:
+    """First tag's content for the first key that has a non-empty one, in priority order."""
+    for key in keys:
+        values = meta.get(key)
+        if values and values[0]:
+            return values[0]
+    return None
+
+
+def _parse_rfc_datetime(text: str) -> datetime:
+    """Parse '%a, %d %b %Y %H:%M:%S', falling back to strptime off the common shape."""
+    match = _RFC_DATETIME_RE.fullmatch(text)
+    month = _MONTHS.get(match[2].lower()) if match else None
+    if month is None:
+        return datetime.strptime(text, "%a, %d %b %Y %H:%M:%S")
+    day, _, year, hour, minute, second = match.groups()
+    return datetime(int(year), month, int(day), int(hour), int(minute), int(second))
+
+
+# Links never worth fetching: (subdomain, or None for any, and a slug pattern)
+_SKIP_RULES = (
+    (None, re.compile('lotto')),
+    ('cebudailynews', re.compile('daily-gospel')),
+)
+
+
+def _should_skip(url_meta: dict) -> bool:
+    """True if a parsed article URL matches any of _SKIP_RULES."""
+    return any(
+        (subdomain is None or subdomain == url_meta['subdomain']) and pattern.search(url_meta['slug'])
+        for subdomain, pattern in _SKIP_RULES
+    )
+
+
+def _without_skipped(rows: list[dict]) -> list[dict]:
+    """
+    Drop DB rows whose URL matches a skip rule before they are requested —
+    stubs stored before a rule existed would otherwise each cost a full
+    (often Camoufox) page fetch only to be thrown away.
+    """
+    kept = [row for row in rows if not _should_skip(_parse_inq_art_url(row['url']))]
+    if len(kept) < len(rows):
+        logger.info(f'Skipping {len(rows) - len(kept)} articles matched by skip rules.')
+    return kept
 
 
 def _make_article_id(url_meta: dict) -> str:
     return f"{url_meta['subdomain']}:{url_meta['article_id']}:{url_meta['slug']}"
 
 
+def _interleave_by_host(rows: list[dict]) -> Iterator[dict]:
+    """
+    Yield rows round-robin across their URL hosts (one per subdomain in turn).
+
+    Scrapy throttles per host, but the global CONCURRENT_REQUESTS budget also
+    counts requests queued behind a busy host — so rows grouped by subdomain
+    would fill it with one site's backlog and crawl the subdomains one after
+    another. Interleaving keeps every subdomain downloading at once.
+    """
+    by_host = defaultdict(list)
+    for row in rows:
+        by_host[urlparse(row['url']).hostname].append(row)
+    for batch in itertools.zip_longest(*by_host.values()):
+        yield from filter(None, batch)
+
+
 # ── PHASE 1: Collect URLs only ────────────────────────────────────────────────
 
 class InquirerLinkSpider(scrapy.Spider):
@@ -50,6 +173,15 @@ class InquirerLinkSpider(scrapy.Spider):
     name = 'inquirer_links'
     allowed_domains = ['inquirer.net']
 
+    # Index pages are small and served from www.inquirer.net, outside the
+    # Cloudflare-protected subdomains — fetch several days at once instead of
+    # one per autothrottled DOWNLOAD_DELAY on a long date range
+    custom_settings = {
+        'CONCURRENT_REQUESTS_PER_DOMAIN': 8,
+        'DOWNLOAD_DELAY': 0.25,
+        'AUTOTHROTTLE_ENABLED': False,
+    }
+
     def __init__(self, start_date: str, end_date: str = None, categories: str = None, **kwargs):
         super().__init__(**kwargs)
         self.url_dt_format = '%Y-%m-%d'
@@ -59,14 +191,17 @@ class InquirerLinkSpider(scrapy.Spider):
 
         # Load all existing Inquirer IDs from DB once at spider init.
         # Stored as a set for O(1) lookup — much faster than querying per article.
-        db = get_storage_backend(backend_type=STORAGE_BACKEND)
-        rows = db.fetch_all(
+        # The connection stays open and is reused by DatabasePipeline.
+        self.db = get_storage_backend(backend_type=STORAGE_BACKEND)
+        rows = self.db.fetch_all(
             f"SELECT DISTINCT id FROM {os.getenv('TABLE_NAME')} WHERE source = 'inquirer'"
         )
         self.existing_ids = {row[0] for row in rows}
-        db.close()
         logger.info(f'Phase 1: {len(self.existing_ids)} existing Inquirer IDs loaded from DB.')
 
+    def closed(self, reason):
+        self.db.close()
+
     def start_requests(self):
         current_date = self.start_date
         while current_date <= self.end_date:
@@ -85,6 +220,7 @@ class InquirerLinkSpider(scrapy.Spider):
 
         inserted = 0
         skipped = 0
+        excluded = 0
 
         for section in sections:
             category = section.css('::text').get(default='').strip()
@@ -103,10 +239,8 @@ class InquirerLinkSpider(scrapy.Spider):
                     logger.warning(f'Skipping unparseable URL {link}: {e}')
                     continue
 
-                if 'lotto' in url_meta['slug']:
-                    continue
-
-                if url_meta['subdomain'] == 'cebudailynews' and 'daily-gospel' in url_meta['slug']:
+                if _should_skip(url_meta):
+                    excluded += 1
                     continue
 
                 article_id = _make_article_id(url_meta)
@@ -130,7 +264,7 @@ class InquirerLinkSpider(scrapy.Spider):
 
         logger.info(
             f'Phase 1 [{response.meta["current_date"]}]: '
-            f'{inserted} new articles queued, {skipped} already in DB.'
+            f'{inserted} new articles queued, {skipped} already in DB, {excluded} excluded by skip rules.'
         )
 
 
@@ -154,7 +288,8 @@ class InquirerArticleSpider(scrapy.Spider):
         },
         'RETRY_HTTP_CODES': [429, 500, 502, 504], # Handled by RetryMiddleware; 403/503 go to Camoufox
         'RETRY_TIMES': 2,
-        'CONCURRENT_REQUESTS': 8,
+        # Per-domain slots are per subdomain host; the global cap lets several run together
+        'CONCURRENT_REQUESTS': 24,
         'CONCURRENT_REQUESTS_PER_DOMAIN': 6,
         'DOWNLOAD_DELAY': 0.25,
         'AUTOTHROTTLE_ENABLED': False,
@@ -176,7 +311,7 @@ class InquirerArticleSpider(scrapy.Spider):
             logger.info('Phase 2: No pending articles — skipping article crawl.')
             return
 
-        for row in pending:
+        for row in _interleave_by_host(_without_skipped(pending)):
             yield scrapy.Request(
                 url=row['url'],
                 callback=self.parse_article_details,
@@ -189,6 +324,7 @@ class InquirerArticleSpider(scrapy.Spider):
 
     def parse_article_details(self, response):
         url_meta = _parse_inq_art_url(response.url)
+        meta = _meta_contents(response)
 
         yield ArticleItem(
             id=_make_article_id(url_meta),
@@ -196,20 +332,20 @@ class InquirerArticleSpider(scrapy.Spider):
             url=response.url,
             category=response.meta['category'],
             date=response.meta['current_date'],
-            title=self._extract_title(response, url_meta),
-            author=self._extract_author(response, url_meta),
-            publish_time=self._extract_publish_time(response),
+            title=self._extract_title(response, url_meta, meta),
+            author=self._extract_author(response, url_meta, meta),
+            publish_time=self._extract_publish_time(response, meta),
             raw_content=self._extract_content(response, url_meta),
             tags=self._extract_tags(response, url_meta),
         )
 
     # ── EXTRACTORS ────────────────────────────────────────────────────────────
 
-    def _extract_title(self, response, url_metadata) -> str:
+    def _extract_title(self, response, url_metadata, meta) -> str:
         try:
             # 1. Prioritize meta tags (og:title, then standard title)
             meta_title = (
-                response.css('meta[property="og:title"]::attr(content)').get()
+                _first_meta(meta, ('property', 'og:title'))
                 or response.css('title::text').get()
             )
             if meta_title:
@@ -237,13 +373,11 @@ class InquirerArticleSpider(scrapy.Spider):
             logger.debug(traceback.format_exc())
             return 'Error extracting title'
 
-    def _extract_author(self, response, url_metadata) -> str:
+    def _extract_author(self, response, url_metadata, meta) -> str:
         try:
             # 1. Prioritize meta tags (meta name="author", twitter:data1, or article:author)
-            meta_author = (
-                response.css('meta[name="author"]::attr(content)').get()
-                or response.css('meta[name="twitter:data1"]::attr(content)').get()
-                or response.css('meta[property="article:author"]::attr(content)').get()
+            meta_author = _first_meta(
+                meta, ('name', 'author'), ('name', 'twitter:data1'), ('property', 'article:author'),
             )
             if meta_author:
                 return meta_author.strip()
@@ -279,13 +413,7 @@ class InquirerArticleSpider(scrapy.Spider):
 
     def _extract_content(self, response, url_metadata) -> str:
         try:
-            content_selectors = {
-                'lifestyle': 'div.elementor-widget-theme-post-content',
-                'pop': 'div#TO_target_content',
-                'cebudailynews': 'div#article-content',
-                'usa': 'div#TO_target_content',
-            }
-            selector = content_selectors.get(url_metadata['subdomain'], 'div#FOR_target_content')
+            selector = _CONTENT_SELECTORS.get(url_metadata['subdomain'], _DEFAULT_CONTENT_SELECTOR)
             return response.css(selector).get(default='Cannot extract article content')
         except Exception as e:
             logger.error(f'Error extracting content: {e}')
@@ -307,13 +435,14 @@ class InquirerArticleSpider(scrapy.Spider):
         finally:
             return ', '.join(tags)
 
-    def _extract_publish_time(self, response) -> datetime | None:
+    def _extract_publish_time(self, response, meta) -> datetime | None:
         publish_time = None
         try:
             # 1. Prioritize OpenGraph / Meta tags
             meta_tags = (
-                response.css('meta[property="article:published_time"]::attr(content)').getall()
-                or response.css('meta[name="parsely-pub-date"]::attr(content)').getall()
+                meta.get(('property', 'article:published_time'))
+                or meta.get(('name', 'parsely-pub-date'))
+                or []
             )
             for content in meta_tags:
                 try:
@@ -321,7 +450,7 @@ class InquirerArticleSpider(scrapy.Spider):
                         cleaned = content.strip()
                         for tz_label in ('PST', 'PHT', 'UTC', 'GMT'):
                             cleaned = cleaned.replace(tz_label, '').strip()
-                        publish_time = datetime.strptime(cleaned, "%a, %d %b %Y %H:%M:%S")
+                        publish_time = _parse_rfc_datetime(cleaned)
                     else:
                         publish_time = datetime.fromisoformat(content)
                     return publish_time
@@ -366,7 +495,8 @@ class InquirerResolveSpider(InquirerArticleSpider):
         },
         'RETRY_HTTP_CODES': [429, 500, 502, 504], # Handled by RetryMiddleware; 403/503 go to Camoufox
         'RETRY_TIMES': 2,
-        'CONCURRENT_REQUESTS': 8,
+        # Per-domain slots are per subdomain host; the global cap lets several run together
+        'CONCURRENT_REQUESTS': 24,
         'CONCURRENT_REQUESTS_PER_DOMAIN': 6,
         'DOWNLOAD_DELAY': 0.25,
         'AUTOTHROTTLE_ENABLED': False,
@@ -380,7 +510,7 @@ class InquirerResolveSpider(InquirerArticleSpider):
 
     def start_requests(self):
         logger.info(f'Resolve: {len(self.rows)} unextracted articles to re-crawl.')
-        for row in self.rows:
+        for row in _interleave_by_host(_without_skipped(self.rows)):
             yield scrapy.Request(
                 url=row['url'],
                 callback=self.parse_article_details,
@@ -442,6 +572,7 @@ def debug_article(url: str) -> dict:
 
     fake_response = FakeResponse(response.text, url)
     url_meta = _parse_inq_art_url(url)
+    meta = _meta_contents(fake_response)
 
     # Instantiate spider without calling __init__ (no DB connection needed)
     spider = InquirerArticleSpider.__new__(InquirerArticleSpider)
@@ -450,9 +581,9 @@ def debug_article(url: str) -> dict:
         'url':          url,
         'url_meta':     url_meta,
         'id':           _make_article_id(url_meta),
-        'title':        spider._extract_title(fake_response, url_meta),
-        'author':       spider._extract_author(fake_response, url_meta),
-        'publish_time': spider._extract_publish_time(fake_response),
+        'title':        spider._extract_title(fake_response, url_meta, meta),
+        'author':       spider._extract_author(fake_response, url_meta, meta),
+        'publish_time': spider._extract_publish_time(fake_response, meta),
         'tags':         spider._extract_tags(fake_response, url_meta),
         'content':      spider._extract_content(fake_response, url_meta),
     }
@@ -1,12 +1,15 @@
 import os
-from dotenv import load_dotenv
-from bs4 import BeautifulSoup
+import time
 from util.storage_backend import get_storage_backend
-from util.tools import html_to_markdown
+from util.tools import html_to_markdown, load_env
 
-load_dotenv()
+load_env()
 STORAGE_BACKEND = os.getenv('STORAGE_BACKEND', 'duckdb')
 
+# Items per storage write, and the longest an item waits in a partial batch
+UPSERT_BATCH_SIZE = 50
+UPSERT_FLUSH_SECONDS = 30
+
 
 class InquirerCleaningPipeline:
     """Remove unwanted tags/ids/classes and convert HTML to Markdown."""
@@ -31,22 +34,14 @@ class InquirerCleaningPipeline:
         if 'raw_content' not in item:
             return item
 
-        html = item['raw_content']
-        soup = BeautifulSoup(html, 'html.parser')
-
-        for uid in self.unwanted_ids:
-            for tag in soup.select(f'#{uid}'):
-                tag.decompose()
-
-        for cls_ in self.unwanted_classes:
-            for tag in soup.select(f'.{cls_}'):
-                tag.decompose()
-
-        for t in self.unwanted_tags:
-            for tag in soup.find_all(t):
-                tag.decompose()
-
-        item['cleaned_content'] = html_to_markdown(str(soup))
+        # html_to_markdown strips the unwanted nodes itself while the page is
+        # parsed with lxml, so the HTML is parsed once instead of twice
+        item['cleaned_content'] = html_to_markdown(
+            item['raw_content'],
+            unwanted_ids=self.unwanted_ids,
+            unwanted_classes=self.unwanted_classes,
+            unwanted_tags=self.unwanted_tags,
+        )
         return item
 
 
@@ -54,14 +49,37 @@ class DatabasePipeline:
     """
     Phase 1 — INSERT stub records (url + metadata, content fields NULL).
     Phase 2 — UPSERT: update existing stubs with full content on id match.
+
+    Reuses the spider's own storage connection when it has one (the spider
+    closes it), so each crawl holds a single connection to the DB.
+
+    Items are written UPSERT_BATCH_SIZE at a time (or after UPSERT_FLUSH_SECONDS),
+    one transaction per batch instead of a commit per article.
     """
 
     def open_spider(self, spider):
-        self.db = get_storage_backend(backend_type=STORAGE_BACKEND)
+        self.db = getattr(spider, 'db', None)
+        self.owns_db = self.db is None
+        if self.owns_db:
+            self.db = get_storage_backend(backend_type=STORAGE_BACKEND)
+        self.pending = []
+        self.last_flush = time.monotonic()
 
     def close_spider(self, spider):
-        self.db.close()
+        # Runs before the spider's own closed(), so its connection is still open
+        self._flush()
+        if self.owns_db:
+            self.db.close()
 
     def process_item(self, item, spider):
-        self.db.upsert_record(item)
-        return item
\ No newline at end of file
+        self.pending.append(item)
+        if (len(self.pending) >= UPSERT_BATCH_SIZE
+                or time.monotonic() - self.last_flush >= UPSERT_FLUSH_SECONDS):
+            self._flush()
+        return item
+
+    def _flush(self):
+        if self.pending:
+            self.db.upsert_many(self.pending)
+            self.pending = []
+        self.last_flush = time.monotonic()
\ No newline at end of file
@@ -16,10 +16,9 @@ Usage:
 
 import os
 import duckdb
-from dotenv import load_dotenv
-from util.tools import setup_logger
+from util.tools import load_env, setup_logger
 
-load_dotenv()
+load_env()
 logger = setup_logger()
 
 
@@ -5,25 +5,43 @@ Supports SQLite, DuckDB, MotherDuck, and BigQuery storage backends.
 
 from abc import ABC, abstractmethod
 from typing import Dict, Any, List
+import itertools
 import sqlite3
-import duckdb
-import pandas as pd
-from google.cloud import bigquery
 import os
-from dotenv import load_dotenv
 import asyncio
 import threading
 import traceback
 
-from util.tools import setup_logger
+from util.tools import load_env, setup_logger
 
 # Load environment variables from .env file
-load_dotenv()
+load_env()
 
 gcp_project_id = os.getenv('GCP_PROJECT_ID')
 table_name = os.getenv('TABLE_NAME')
 logger = setup_logger()
 
+# Article item keys in table column order (items carry 'cleaned_content',
+# which is stored in the 'content' column)
+_ITEM_FIELDS = ('id', 'source', 'url', 'category', 'title', 'author',
+                'date', 'publish_time', 'cleaned_content', 'tags')
+_TABLE_COLUMNS = ('id', 'source', 'url', 'category', 'title', 'author',
+                  'date', 'publish_time', 'content', 'tags')
+_COLUMN_LIST = ', '.join(_TABLE_COLUMNS)
+_PLACEHOLDERS = ','.join('?' * len(_TABLE_COLUMNS))
+
+# Phase 1 crawler stubs carry only these columns (same names in item and table)
+_STUB_FIELDS = ('id', 'source', 'url', 'category', 'date')
+
+# Rows per multi-row SQLite INSERT, kept under the 999 bound parameters older
+# SQLite builds allow per statement
+SQLITE_ROWS_PER_INSERT = 999 // len(_TABLE_COLUMNS)
+
+
+def _row_params(item: Dict[str, Any]) -> tuple:
+    """Bind parameters for one article item, in _TABLE_COLUMNS order."""
+    return tuple(map(item.get, _ITEM_FIELDS))
+
 
 class StorageBackend(ABC):
     """Abstract base class for storage backends."""
@@ -32,6 +50,14 @@ class StorageBackend(ABC):
     def insert_record(self, item: Dict[str, Any]) -> None:
         """Insert a single record into storage. Skips silently if id already exists."""
         pass
+
+    def insert_many(self, items: List[Dict[str, Any]]) -> None:
+        """
+        Insert a batch of records. Skips silently any id that already exists.
+        Backends override this with a single bulk write where they can.
+        """
+        for item in items:
+            self.insert_record(item)
     
     @abstractmethod
     def fetch_all(self, query: str) -> List[Any]:
@@ -48,6 +74,13 @@ class StorageBackend(ABC):
         """Check if a record with the given id already exists."""
         pass
 
+    def existing_ids(self, record_ids: List[str]) -> set:
+        """
+        Return the subset of record_ids that already exist.
+        Backends override this with a single set-based query where they can.
+        """
+        return {record_id for record_id in record_ids if self.record_exists(record_id)}
+
     @abstractmethod
     def upsert_record(self, item: Dict[str, Any]) -> None:
         """
@@ -57,6 +90,14 @@ class StorageBackend(ABC):
         """
         pass
 
+    def upsert_many(self, items: List[Dict[str, Any]]) -> None:
+        """
+        Upsert a batch of records with upsert_record semantics.
+        Backends override this with a single transaction where they can.
+        """
+        for item in items:
+            self.upsert_record(item)
+
     @abstractmethod
     def get_pending_articles(self) -> List[Dict[str, Any]]:
         """Return articles where title IS NULL (phase 1 stubs not yet populated)."""
@@ -67,6 +108,13 @@ class StorageBackend(ABC):
         """Close the storage connection."""
         pass
 
+    async def aclose(self) -> None:
+        """
+        Close from inside a running event loop.
+        Backends with background writer tasks override this to await them.
+        """
+        self.close()
+
 
 class SQLiteBackend(StorageBackend):
     """SQLite storage backend implementation."""
@@ -74,8 +122,47 @@ class SQLiteBackend(StorageBackend):
     def __init__(self, db_path: str, table_name: str):
         self.db_path = db_path
         self.table_name = table_name
-        self.conn = sqlite3.connect(db_path)
+        # The API scrapers open the backend on the event loop but call it from
+        # their single storage thread — one caller at a time, so sharing is safe
+        self.conn = sqlite3.connect(db_path, check_same_thread=False)
         self.cursor = self.conn.cursor()
+        # Built once; sqlite3 caches the prepared statement by its SQL text
+        self._insert_sql = (
+            f"INSERT OR IGNORE INTO {table_name} ({_COLUMN_LIST}) VALUES ({_PLACEHOLDERS})"
+        )
+        # Multi-row INSERT statements, keyed by row count and built on first use
+        self._insert_rows_sql: Dict[int, str] = {}
+        self._stub_sql = (
+            f"INSERT OR IGNORE INTO {table_name} ({', '.join(_STUB_FIELDS)}) "
+            f"VALUES ({','.join('?' * len(_STUB_FIELDS))})"
+        )
+        self._upsert_sql = f'''
+            INSERT INTO {table_name} ({_COLUMN_LIST})
+            VALUES ({_PLACEHOLDERS})
+            ON CONFLICT (id) DO UPDATE SET
+                title        = excluded.title,
+                author       = excluded.author,
+                publish_time = excluded.publish_time,
+                content      = excluded.content,
+                tags         = excluded.tags
+        '''
+
+        # Larger pages for a fresh file (text-heavy rows); page_size can only
+        # change before the first table exists and before WAL is enabled
+        if self.conn.execute('PRAGMA page_count').fetchone()[0] == 0:
+            self.conn.execute('PRAGMA page_size=8192')
+
+        # WAL + NORMAL sync: commits append to the log instead of fsyncing the db file
+        journal_mode = self.conn.execute('PRAGMA journal_mode=WAL').fetchone()[0]
+        if journal_mode.lower() != 'wal':
+            # e.g. in-memory databases, or filesystems without shared-memory support
+            logger.warning(f"SQLite WAL mode unavailable, using journal_mode={journal_mode}")
+        self.conn.execute('PRAGMA synchronous=NORMAL')
+        # Temp tables/indices in RAM, up to a 256 MiB page cache (negative = KiB),
+        # and reads served from a 256 MiB memory map instead of read() syscalls
+        self.conn.execute('PRAGMA temp_store=MEMORY')
+        self.conn.execute('PRAGMA cache_size=-262144')
+        self.conn.execute('PRAGMA mmap_size=268435456')
         
         logger.info(f"Connected to SQLite database at {db_path}.")
         self._create_table()
@@ -113,23 +200,7 @@ class SQLiteBackend(StorageBackend):
         """
         try:
             if self.table_name == table_name:
-                self.cursor.execute(f'''
-                    INSERT OR IGNORE INTO {table_name}
-                        (id, source, url, category, title, author, 
-                         date, publish_time, content, tags)
-                    VALUES (?,?,?,?,?,?,?,?,?,?)
-                ''', (
-                    item.get('id'),
-                    item.get('source'),
-                    item.get('url'),
-                    item.get('category'),
-                    item.get('title'),
-                    item.get('author'),
-                    item.get('date'),
-                    item.get('publish_time'),
-                    item.get('cleaned_content'),
-                    item.get('tags'),
-                ))
+                self.cursor.execute(self._insert_sql, _row_params(item))
             else:
                 raise ValueError(f"Unknown table name: {self.table_name}")
         except Exception as e:
@@ -137,6 +208,50 @@ class SQLiteBackend(StorageBackend):
         finally:    
             self.conn.commit()
 
+    def _insert_rows(self, row_count: int) -> str:
+        """INSERT OR IGNORE SQL for row_count rows in one statement."""
+        sql = self._insert_rows_sql.get(row_count)
+        if sql is None:
+            sql = self._insert_rows_sql[row_count] = (
+                f"INSERT OR IGNORE INTO {self.table_name} ({_COLUMN_LIST}) VALUES "
+                + ','.join([f'({_PLACEHOLDERS})'] * row_count)
+            )
+        return sql
+
+    def insert_many(self, items: List[Dict[str, Any]]) -> None:
+        """
+        Insert a batch of records with multi-row INSERTs and a single commit.
+        One statement per SQLITE_ROWS_PER_INSERT rows runs the VM once per chunk
+        instead of once per row, as executemany() would.
+        Uses INSERT OR IGNORE so existing records are never overwritten.
+        A chunk that fails is retried row by row, so one bad row loses only itself.
+        """
+        if not items:
+            return
+        try:
+            if self.table_name == table_name:
+                for start in range(0, len(items), SQLITE_ROWS_PER_INSERT):
+                    chunk = items[start:start + SQLITE_ROWS_PER_INSERT]
+                    try:
+                        self.cursor.execute(
+                            self._insert_rows(len(chunk)),
+                            list(itertools.chain.from_iterable(map(_row_params, chunk))),
+                        )
+                    except Exception as e:
+                        # A failed statement inserts none of its rows
+                        logger.warning(
+                            f"Batch insert of {len(chunk)} records into SQLite failed ({e}); "
+                            "retrying row by row"
+                        )
+                        for item in chunk:
+                            self.insert_record(item)
+            else:
+                raise ValueError(f"Unknown table name: {self.table_name}")
+        except Exception as e:
+            logger.error(f"Error inserting {len(items)} records into SQLite: {e}")
+        finally:
+            self.conn.commit()
+
     def upsert_record(self, item: Dict[str, Any]) -> None:
         """
         Phase 1: INSERT stub only — never overwrites existing content.
@@ -145,47 +260,34 @@ class SQLiteBackend(StorageBackend):
         try:
             if item.get('title') is None:
                 # Phase 1 stub — insert only, never overwrite existing content
-                self.cursor.execute(f'''
-                    INSERT OR IGNORE INTO {self.table_name}
-                        (id, source, url, category, date)
-                    VALUES (?, ?, ?, ?, ?)
-                ''', (
-                    item.get('id'),
-                    item.get('source'),
-                    item.get('url'),
-                    item.get('category'),
-                    item.get('date'),
-                ))
+                self.cursor.execute(self._stub_sql, tuple(map(item.get, _STUB_FIELDS)))
             else:
                 # Phase 2 — update content fields only
-                self.cursor.execute(f'''
-                    INSERT INTO {self.table_name}
-                        (id, source, url, category, title, author,
-                        date, publish_time, content, tags)
-                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                    ON CONFLICT (id) DO UPDATE SET
-                        title        = excluded.title,
-                        author       = excluded.author,
-                        publish_time = excluded.publish_time,
-                        content      = excluded.content,
-                        tags         = excluded.tags
-                ''', (
-                    item.get('id'),
-                    item.get('source'),
-                    item.get('url'),
-                    item.get('category'),
-                    item.get('title'),
-                    item.get('author'),
-                    item.get('date'),
-                    item.get('publish_time'),
-                    item.get('cleaned_content'),
-                    item.get('tags'),
-                ))
+                self.cursor.execute(self._upsert_sql, _row_params(item))
         except Exception as e:
             logger.error(f"Error upserting record into SQLite: {e}")
         finally:
             self.conn.commit()
 
+    def upsert_many(self, items: List[Dict[str, Any]]) -> None:
+        """
+        Upsert a batch with one executemany() per phase and a single commit.
+        Phase 1 stubs are inserted only; phase 2 items update content fields.
+        """
+        if not items:
+            return
+        try:
+            stubs = [tuple(map(item.get, _STUB_FIELDS)) for item in items if item.get('title') is None]
+            full = [_row_params(item) for item in items if item.get('title') is not None]
+            if stubs:
+                self.cursor.executemany(self._stub_sql, stubs)
+            if full:
+                self.cursor.executemany(self._upsert_sql, full)
+        except Exception as e:
+            logger.error(f"Error upserting {len(items)} records into SQLite: {e}")
+        finally:
+            self.conn.commit()
+
     def get_pending_articles(self) -> List[Dict[str, Any]]:
         """Return stub records not yet populated (title IS NULL)."""
         try:
@@ -248,6 +350,20 @@ class SQLiteBackend(StorageBackend):
         except Exception as e:
             logger.error(f'Error checking record existence in SQLite: {e}')
             return False
+
+    def existing_ids(self, record_ids: List[str]) -> set:
+        """Return the subset of record_ids already stored, in one IN (...) query."""
+        if not record_ids:
+            return set()
+        try:
+            self.cursor.execute(
+                f'SELECT id FROM {self.table_name} WHERE id IN ({",".join("?" * len(record_ids))})',
+                tuple(record_ids)
+            )
+            return {row[0] for row in self.cursor.fetchall()}
+        except Exception as e:
+            logger.error(f'Error checking record existence in SQLite: {e}')
+            return set()
     
     def close(self) -> None:
         """Close the SQLite database connection."""
@@ -262,6 +378,7 @@ class DuckDBBackend(StorageBackend):
         self.db_path = db_path
         self.table_name = table_name
         
+        import duckdb
         self.conn = duckdb.connect(database=db_path, read_only=False)
         
         logger.info(f"Connected to DuckDB database at {db_path}.")
@@ -300,23 +417,10 @@ class DuckDBBackend(StorageBackend):
         try:
             if self.table_name == table_name:
                 self.conn.execute(f'''
-                    INSERT INTO {table_name}
-                        (id, source, url, category, title, author, 
-                         date, publish_time, content, tags)
-                    VALUES (?,?,?,?,?,?,?,?,?,?)
+                    INSERT INTO {table_name} ({_COLUMN_LIST})
+                    VALUES ({_PLACEHOLDERS})
                     ON CONFLICT (id) DO NOTHING
-                ''', [
-                    item.get('id'),
-                    item.get('source'),
-                    item.get('url'),
-                    item.get('category'),
-                    item.get('title'),
-                    item.get('author'),
-                    item.get('date'),
-                    item.get('publish_time'),
-                    item.get('cleaned_content'),
-                    item.get('tags'),
-                ])
+                ''', _row_params(item))
                 logger.debug(f"Inserted record (skipped if exists): {item.get('id')}")
             else:
                 raise ValueError(f"Unknown table name: {self.table_name}")
@@ -325,55 +429,90 @@ class DuckDBBackend(StorageBackend):
             logger.error(f"Error inserting record into DuckDB: {e}")
             logger.error(f"Item: {item}")
 
+    def insert_many(self, items: List[Dict[str, Any]]) -> None:
+        """
+        Insert a batch of records as one columnar INSERT ... SELECT.
+        Uses ON CONFLICT DO NOTHING so existing records are never overwritten.
+        Falls back to row-by-row inserts if the batch is rejected, so one bad
+        row does not drop the whole page.
+        """
+        if not items:
+            return
+        import pandas as pd
+
+        try:
+            if self.table_name != table_name:
+                raise ValueError(f"Unknown table name: {self.table_name}")
+
+            # Build the frame column-wise — DuckDB scans it as a columnar batch
+            columns = zip(*map(_row_params, items))
+            batch = pd.DataFrame(dict(zip(_TABLE_COLUMNS, map(list, columns))))
+            self.conn.register('insert_batch', batch)
+            try:
+                self.conn.execute(f'''
+                    INSERT INTO {table_name} ({_COLUMN_LIST})
+                    SELECT {_COLUMN_LIST}
+                    FROM insert_batch
+                    ON CONFLICT (id) DO NOTHING
+                ''')
+            finally:
+                self.conn.unregister('insert_batch')
+            logger.debug(f"Inserted batch of {len(items)} records (existing ids skipped)")
+
+        except Exception as e:
+            logger.error(f"Error batch inserting into DuckDB, retrying row by row: {e}")
+            for item in items:
+                self.insert_record(item)
+
     def upsert_record(self, item: Dict[str, Any]) -> None:
         """
         Phase 1: INSERT stub only — never overwrites existing content.
         Phase 2: UPDATE content fields on id conflict.
         """
+        self.upsert_many([item])
+
+    def upsert_many(self, items: List[Dict[str, Any]]) -> None:
+        """
+        Upsert a batch in one transaction, with one executemany() per phase.
+        Falls back to row-by-row upserts if the batch is rejected, so one bad
+        row does not drop the rest.
+        """
+        if not items:
+            return
+        stubs = [tuple(map(item.get, _STUB_FIELDS)) for item in items if item.get('title') is None]
+        full = [_row_params(item) for item in items if item.get('title') is not None]
         try:
-            if item.get('title') is None:
-                # Phase 1 stub — insert only, never overwrite existing content
-                self.conn.execute(f'''
-                    INSERT INTO {self.table_name}
-                        (id, source, url, category, date)
-                    VALUES (?, ?, ?, ?, ?)
+            self.conn.begin()
+            if stubs:
+                # Phase 1 stubs — insert only, never overwrite existing content
+                self.conn.executemany(f'''
+                    INSERT INTO {self.table_name} ({', '.join(_STUB_FIELDS)})
+                    VALUES ({','.join('?' * len(_STUB_FIELDS))})
                     ON CONFLICT (id) DO NOTHING
-                ''', [
-                    item.get('id'),
-                    item.get('source'),
-                    item.get('url'),
-                    item.get('category'),
-                    item.get('date'),
-                ])
-            else:
+                ''', stubs)
+            if full:
                 # Phase 2 — update content fields only
-                self.conn.execute(f'''
-                    INSERT INTO {self.table_name}
-                        (id, source, url, category, title, author,
-                        date, publish_time, content, tags)
-                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                self.conn.executemany(f'''
+                    INSERT INTO {self.table_name} ({_COLUMN_LIST})
+                    VALUES ({_PLACEHOLDERS})
                     ON CONFLICT (id) DO UPDATE SET
                         title        = EXCLUDED.title,
                         author       = EXCLUDED.author,
                         publish_time = EXCLUDED.publish_time,
                         content      = EXCLUDED.content,
                         tags         = EXCLUDED.tags
-                ''', [
-                    item.get('id'),
-                    item.get('source'),
-                    item.get('url'),
-                    item.get('category'),
-                    item.get('title'),
-                    item.get('author'),
-                    item.get('date'),
-                    item.get('publish_time'),
-                    item.get('cleaned_content'),
-                    item.get('tags'),
-                ])
-            logger.debug(f"Upserted record: {item.get('id')}")
-        except Exception as e:
-            logger.error(f"Error upserting record into DuckDB: {e}")
-            logger.error(f"Item: {item}")
+                ''', full)
+            self.conn.commit()
+            logger.debug(f"Upserted {len(items)} records")
+        except Exception as e:
+            self.conn.rollback()
+            if len(items) == 1:
+                logger.error(f"Error upserting record into DuckDB: {e}")
+                logger.error(f"Item: {items[0]}")
+                return
+            logger.error(f"Error batch upserting into DuckDB, retrying row by row: {e}")
+            for item in items:
+                self.upsert_many([item])
 
     def get_pending_articles(self) -> List[Dict[str, Any]]:
         """Return stub records not yet populated (title IS NULL)."""
@@ -421,7 +560,10 @@ class DuckDBBackend(StorageBackend):
                 
         except Exception as e:
             logger.error(f"Error executing query in DuckDB: {e}")
-            return pd.DataFrame() if return_df else []
+            if not return_df:
+                return []
+            import pandas as pd
+            return pd.DataFrame()
     
     def export_to_parquet(self, output_path: str, query: str = None):
         """
@@ -442,7 +584,7 @@ class DuckDBBackend(StorageBackend):
         except Exception as e:
             logger.error(f"Error exporting to Parquet: {e}")
     
-    def query_csv_directly(self, csv_path: str, query: str) -> pd.DataFrame:
+    def query_csv_directly(self, csv_path: str, query: str) -> 'pd.DataFrame':
         """
         Query CSV file directly without loading into DuckDB.
         
@@ -460,6 +602,7 @@ class DuckDBBackend(StorageBackend):
             return result
         except Exception as e:
             logger.error(f"Error querying CSV: {e}")
+            import pandas as pd
             return pd.DataFrame()
     
     def record_exists(self, record_id: str) -> bool:
@@ -472,6 +615,20 @@ class DuckDBBackend(StorageBackend):
         except Exception as e:
             logger.error(f'Error checking record existence in DuckDB: {e}')
             return False
+
+    def existing_ids(self, record_ids: List[str]) -> set:
+        """Return the subset of record_ids already stored, in one IN (...) query."""
+        if not record_ids:
+            return set()
+        try:
+            rows = self.conn.execute(
+                f'SELECT id FROM {self.table_name} WHERE id IN ({",".join("?" * len(record_ids))})',
+                list(record_ids)
+            ).fetchall()
+            return {row[0] for row in rows}
+        except Exception as e:
+            logger.error(f'Error checking record existence in DuckDB: {e}')
+            return set()
     
     def close(self) -> None:
         """Close the DuckDB database connection."""
@@ -519,6 +676,7 @@ class MotherDuckBackend(DuckDBBackend):
         self.table_name = table_name
 
         # duckdb picks up MOTHERDUCK_TOKEN from the environment automatically
+        import duckdb
         self.conn = duckdb.connect(database=self.db_path, read_only=False)
 
         logger.info(f"Connected to MotherDuck database '{database}'.")
@@ -529,6 +687,9 @@ class BigQueryBackend(StorageBackend):
     """BigQuery storage backend implementation with queue-based batch insert."""
     
     def __init__(self, dataset_id: str, table_name: str, buffer_size: int):
+        # Imported here so the other backends don't pay for the Google Cloud SDK
+        from google.cloud import bigquery
+
         self.dataset_id = dataset_id
         self.table_name = table_name
         self.client = bigquery.Client(project=gcp_project_id)
@@ -542,6 +703,8 @@ class BigQueryBackend(StorageBackend):
         self._queue = asyncio.Queue(maxsize=1000)
         self._processor_task = None
         self._is_processing = False
+        # Loop running the processor; records may be queued from other threads
+        self._loop: asyncio.AbstractEventLoop = None
         
         logger.info(f"Connected to BigQuery dataset {dataset_id}.")
         self._create_dataset_and_table()
@@ -553,6 +716,8 @@ class BigQueryBackend(StorageBackend):
         
     def _create_dataset_and_table(self):
         """Create the dataset and table if they don't exist."""
+        from google.cloud import bigquery
+
         dataset_ref = f'{gcp_project_id}.{self.dataset_id}'
         dataset = bigquery.Dataset(dataset_ref)
         dataset.location = 'US'
@@ -594,7 +759,7 @@ class BigQueryBackend(StorageBackend):
             logger.error(f"Error fetching records from BigQuery: {e}")
             return []
         
-    def run_query(self, query: str) -> pd.DataFrame:
+    def run_query(self, query: str) -> 'pd.DataFrame':
         """
         Execute a BigQuery SQL query and return results as DataFrame.
         
@@ -612,6 +777,7 @@ class BigQueryBackend(StorageBackend):
             return df
         except Exception as e:
             logger.error(f"Error executing query in BigQuery: {e}")
+            import pandas as pd
             return pd.DataFrame()
 
     def _load_existing_ids(self) -> set:
@@ -630,9 +796,30 @@ class BigQueryBackend(StorageBackend):
     def record_exists(self, record_id: str) -> bool:
         return str(record_id) in self._existing_ids
 
+    def existing_ids(self, record_ids: List[str]) -> set:
+        return self._existing_ids.intersection(map(str, record_ids))
+
+    def _enqueue(self, item: Dict[str, Any]) -> None:
+        """
+        Hand a record to the queue processor. From another thread (the API
+        scrapers' storage thread) this waits for room when the queue is full,
+        rather than the record being dropped inside a loop callback.
+        """
+        if self._loop is None:
+            raise RuntimeError("BigQuery queue processor has not been started")
+        try:
+            on_loop = asyncio.get_running_loop() is self._loop
+        except RuntimeError:
+            on_loop = False
+        if on_loop or not self._loop.is_running():
+            # Waiting here would block the very loop that drains the queue
+            self._queue.put_nowait(item)
+        else:
+            asyncio.run_coroutine_threadsafe(self._queue.put(item), self._loop).result()
+
     def insert_record(self, item: Dict[str, Any]) -> None:
         """
-        Add record to queue for processing (non-blocking, synchronous).
+        Add record to queue for processing (synchronous).
         Skips silently if the id is already known — existing records are
         never overwritten.
         """
@@ -643,10 +830,10 @@ class BigQueryBackend(StorageBackend):
 
         self._existing_ids.add(record_id)
         try:
-            asyncio.get_event_loop().call_soon_threadsafe(
-                self._queue.put_nowait, item
-            )
+            self._enqueue(item)
         except Exception as e:
+            # Not queued, so not known either — a later insert may retry it
+            self._existing_ids.discard(record_id)
             logger.error(f"Error adding item to queue: {e}")
 
     def upsert_record(self, item: Dict[str, Any]) -> None:
@@ -655,7 +842,8 @@ class BigQueryBackend(StorageBackend):
         Phase 2: always queue to update content fields.
         """
         record_id = str(item.get('id'))
-        if item.get('title') is None:
+        is_stub = item.get('title') is None
+        if is_stub:
             # Phase 1 stub — skip entirely if record already exists
             if record_id in self._existing_ids:
                 logger.debug(f"Skipping existing record: {record_id}")
@@ -663,10 +851,10 @@ class BigQueryBackend(StorageBackend):
             self._existing_ids.add(record_id)
         # Phase 2 items always go through to update content
         try:
-            asyncio.get_event_loop().call_soon_threadsafe(
-                self._queue.put_nowait, item
-            )
+            self._enqueue(item)
         except Exception as e:
+            if is_stub:
+                self._existing_ids.discard(record_id)
             logger.error(f"Error adding item to queue for upsert: {e}")
 
     def get_pending_articles(self) -> List[Dict[str, Any]]:
@@ -687,6 +875,9 @@ class BigQueryBackend(StorageBackend):
 
     async def _flush_buffer_async(self) -> None:
         """Async version of flush buffer."""
+        import pandas as pd
+        from google.cloud import bigquery
+
         if not self.buffer:
             return
         
@@ -713,7 +904,7 @@ class BigQueryBackend(StorageBackend):
                 write_disposition=bigquery.WriteDisposition.WRITE_APPEND,
             )
             
-            loop = asyncio.get_event_loop()
+            loop = asyncio.get_running_loop()
             await loop.run_in_executor(
                 None,
                 self._sync_load_to_bigquery,
@@ -737,6 +928,7 @@ class BigQueryBackend(StorageBackend):
             loop = asyncio.new_event_loop()
             asyncio.set_event_loop(loop)
         
+        self._loop = loop
         self._processor_task = asyncio.create_task(self._process_queue())
         self._is_processing = True
         logger.info("Background queue processor started")
@@ -752,6 +944,7 @@ class BigQueryBackend(StorageBackend):
                     
                     if item is None:
                         logger.info("Received stop sentinel, shutting down processor")
+                        self._queue.task_done()
                         break
                     
                     self.buffer.append(item)
@@ -787,12 +980,14 @@ class BigQueryBackend(StorageBackend):
         """Stop the background processor gracefully."""
         logger.info("Stopping queue processor...")
         
-        self._is_processing = False
+        # The sentinel is queued behind any pending items, so everything already
+        # enqueued is buffered and flushed before the processor exits
         await self._queue.put(None)
         await self._queue.join()
         
         if self._processor_task:
             await self._processor_task
+        self._is_processing = False
         
         logger.info("Queue processor stopped successfully")
     
@@ -818,6 +1013,23 @@ class BigQueryBackend(StorageBackend):
             if self.buffer:
                 logger.warning(f"{len(self.buffer)} items may not have been flushed")
         
+        self._dedup_and_disconnect()
+
+    async def aclose(self) -> None:
+        """Await the queue processor's final flush, then dedup and close."""
+        logger.info("Closing BigQuery backend...")
+
+        try:
+            await self._stop_processor()
+        except Exception as e:
+            logger.error(f"Error stopping processor: {e}")
+            if self.buffer:
+                logger.warning(f"{len(self.buffer)} items may not have been flushed")
+
+        self._dedup_and_disconnect()
+
+    def _dedup_and_disconnect(self) -> None:
+        """Collapse duplicate ids left by phase 1/phase 2 writes, then close the client."""
         # Dedup: for each id, keep the row with content populated (phase 2 wins
         # over stubs); fall back to most recent publish_time if both have content.
         try:
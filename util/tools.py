@@ -1,3 +1,25 @@
+import functools
+import re
+
+try:
+    # orjson decodes in C; large listing payloads with inline HTML parse several times faster
+    from orjson import loads as _json_loads
+except ImportError:
+    from json import loads as _json_loads
+
+
+################### ENVIRONMENT ###################
+@functools.lru_cache(maxsize=1)
+def load_env() -> None:
+    """
+    Load variables from the .env file into os.environ, once per process.
+    Every module calls this at import; only the first call touches the file.
+    """
+    from dotenv import load_dotenv
+
+    load_dotenv()
+
+
 ################### LOGGER ###################
 def setup_logger(log_file="app.log"):
     """
@@ -27,6 +49,12 @@ def setup_logger(log_file="app.log"):
 
 
 ################### ASYNC HTTP REQUESTS ###################
+# Statuses that mean "slow down / try again" rather than a hard failure
+_RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+# Longest wait between attempts, whether from backoff or a server's Retry-After
+_MAX_RETRY_DELAY = 30
+
+
 async def async_get(
         session,
         url: str,
@@ -38,19 +66,69 @@ async def async_get(
                 'Accept-Encoding': 'gzip, deflate, br', # aiohttp handles decompression automatically
             },
         cookies: dict[str, str | int] = {},
+        max_retries: int = 3,
+        response_headers: dict[str, str] | None = None,
         **kwargs):
-    async with session.get(url, params=params, headers=headers, cookies=cookies) as response:
-        if response.status == 200:
-            result = await response.json()
-        
-            # If there are any kwargs passed, update the result
-            if kwargs:
-                result.update(kwargs)
+    """
+    GET a JSON endpoint. Throttling and transient server errors (429/5xx) are
+    retried with jittered exponential backoff, honouring Retry-After, so
+    callers don't need a fixed sleep between requests.
+
+    If response_headers is given, it is filled with the successful response's
+    headers, names lower-cased (e.g. WordPress's 'x-wp-totalpages').
+    """
+    import asyncio
+    import random
+
+    for attempt in range(max_retries + 1):
+        async with session.get(url, params=params, headers=headers, cookies=cookies) as response:
+            if response.status == 200:
+                if response_headers is not None:
+                    response_headers.update((name.lower(), value) for name, value in response.headers.items())
+                # Decode straight from the body bytes — skips building a str copy
+                # of the whole payload first, as response.json() would
+                result = _json_loads(await response.read())
             
-            return result
+                # If there are any kwargs passed, update the result
+                if kwargs:
+                    result.update(kwargs)
+                
+                return result
+            if response.status not in _RETRY_STATUSES or attempt == max_retries:
+                raise Exception(f"Error fetching {url}: Status: {response.status}, params: {params}")
+            retry_after = response.headers.get('Retry-After', '')
+
+        if retry_after.isdigit():
+            # Honour the server's hint, but never park a worker for an hour on it
+            delay = min(float(retry_after), _MAX_RETRY_DELAY)
         else:
-            raise Exception(f"Error fetching {url}: Status: {response.status}, params: {params}")
+            delay = random.uniform(0, min(_MAX_RETRY_DELAY, 0.5 * 2 ** attempt))
+        await asyncio.sleep(delay)
 ################### CONVERT HTML RAW CONTENT TO MARKDOWN ###################
+_MULTI_NEWLINE_RE = re.compile(r'\n{3,}')
+_MULTI_SPACE_RE = re.compile(r' +')
+# lxml rejects str input that declares its own encoding; the text is already decoded
+_XML_DECLARATION_RE = re.compile(r'^\s*<\?xml[^>]*\?>')
+
+
+@functools.lru_cache(maxsize=None)
+def _unwanted_nodes_xpath(id_count: int, class_count: int):
+    """
+    Compile one union XPath matching any of id_count ids or class_count classes,
+    so the tree is walked once however many filters there are. The values are
+    bound per call as XPath variables ($id0.., $class0..), so the expression is
+    built once per filter shape rather than per article.
+    """
+    from lxml import etree
+
+    tests = [f'@id = $id{i}' for i in range(id_count)]
+    tests += [
+        f"contains(concat(' ', normalize-space(@class), ' '), $class{i})"
+        for i in range(class_count)
+    ]
+    return etree.XPath(f"//*[{' or '.join(tests)}]")
+
+
 def html_to_markdown(
         html_content: str,  # Changed from 'html' to 'html_content'
         unwanted_ids: list[str] = [],
@@ -59,28 +137,41 @@ def html_to_markdown(
     
     import html
     import html2text
-    from bs4 import BeautifulSoup
-    import re
+    import lxml.html
+    from lxml import etree
     
     # Unescape HTML entities
     unescaped_html = html.unescape(html_content)  # Now using html_content parameter
-    
-    soup = BeautifulSoup(unescaped_html, 'html.parser')
+    if not unescaped_html.strip():
+        return ''
+
+    # lxml parses in C — much faster than BeautifulSoup's html.parser
+    try:
+        tree = lxml.html.fromstring(_XML_DECLARATION_RE.sub('', unescaped_html, count=1))
+    except (etree.ParserError, ValueError):
+        # Nothing lxml can build a tree from (e.g. a body that is only a comment)
+        return ''
 
-    # Remove by id
-    for id in unwanted_ids:
-        for tag in soup.select(f'#{id}'):
-            tag.decompose()
+    # The parsed root is what gets serialized below, so removing it from its
+    # parent (or strip_elements, which never strips the root) would leave it in
+    # place — an unwanted root leaves nothing, as decompose() did
+    if tree.tag in unwanted_tags:
+        return ''
 
-    # Remove by class
-    for html_class in unwanted_classes:
-        for tag in soup.select(f'.{html_class}'):
-            tag.decompose()
+    # Remove by id / class in one pass (drop_tree keeps the trailing text, like decompose)
+    if unwanted_ids or unwanted_classes:
+        xpath = _unwanted_nodes_xpath(len(unwanted_ids), len(unwanted_classes))
+        variables = {f'id{i}': value for i, value in enumerate(unwanted_ids)}
+        variables.update({f'class{i}': f' {value} ' for i, value in enumerate(unwanted_classes)})
+        for node in xpath(tree, **variables):
+            if node is tree:
+                return ''
+            if node.getparent() is not None:
+                node.drop_tree()
 
-    # Remove by tag name
-    for tag_str in unwanted_tags:
-        for tag in soup.find_all(tag_str):
-            tag.decompose()
+    # Remove by tag name in a single C-level pass
+    if unwanted_tags:
+        etree.strip_elements(tree, *unwanted_tags, with_tail=False)
 
     # Convert to markdown
     html2md = html2text.HTML2Text()
@@ -90,10 +181,10 @@ def html_to_markdown(
     html2md.ignore_emphasis = True
     html2md.skip_internal_links = True
     
-    markdown_content = html2md.handle(str(soup))
+    markdown_content = html2md.handle(lxml.html.tostring(tree, encoding='unicode'))
     
     # Clean up extra whitespace
-    markdown_content = re.sub(r'\n{3,}', '\n\n', markdown_content)
-    markdown_content = re.sub(r' +', ' ', markdown_content)
+    markdown_content = _MULTI_NEWLINE_RE.sub('\n\n', markdown_content)
+    markdown_content = _MULTI_SPACE_RE.sub(' ', markdown_content)
     
     return markdown_content.strip()
\ No newline at end of file